@@ -127,6 +127,9 @@ def create_app() -> FastAPI:
         Store.instance().start_device_reconnector()
     except Exception as _e:
         print("Device reconnector warning:", _e)
+    # On shutdown stop the reconnector; this also writes device statuses still
+    # queued for the background status flusher
+    app.add_event_handler("shutdown", Store.instance().stop_device_reconnector)
 
     # Start system metrics sampler
     try:
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import os
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 def _app_folder() -> Path:
@@ -29,15 +31,64 @@ def app_db_path() -> Path:
     return _app_folder() / "app.db"
 
 
-def _conn() -> sqlite3.Connection:
-    p = app_db_path()
-    conn = sqlite3.connect(str(p))
+# Connection of the transaction open on this thread (see transaction())
+_tx = threading.local()
+
+
+def _connect(**kwargs: Any) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(app_db_path()), **kwargs)
     conn.row_factory = sqlite3.Row
+    # Per-connection tuning; journal_mode=WAL is persisted in the file by init()
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-20000")
     return conn
 
 
+@contextmanager
+def _conn() -> Iterator[sqlite3.Connection]:
+    # Inside transaction(): reuse its connection and leave the commit to it
+    tx = getattr(_tx, "conn", None)
+    if tx is not None:
+        yield tx
+        return
+    conn = _connect()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Run every App DB write on this thread in one BEGIN IMMEDIATE/COMMIT.
+
+    Nested calls join the outer transaction. Keep the body short: the App DB
+    write lock is held until it exits.
+    """
+    if getattr(_tx, "conn", None) is not None:
+        yield _tx.conn
+        return
+    conn = _connect(isolation_level=None)
+    conn.execute("BEGIN IMMEDIATE")
+    _tx.conn = conn
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        _tx.conn = None
+        conn.close()
+
+
 def init() -> None:
     with _conn() as c:
+        # WAL: readers keep working while the reconnect loop / API threads write
+        c.execute("PRAGMA journal_mode=WAL")
         c.execute(
             """
             CREATE TABLE IF NOT EXISTS app_meta (
@@ -263,18 +314,21 @@ def save_schema(schema: Dict[str, Any]) -> None:
     with _conn() as c:
         c.execute("INSERT OR REPLACE INTO app_schemas (id,name) VALUES (?,?)", (schema["id"], schema["name"]))
         c.execute("DELETE FROM app_schema_fields WHERE schema_id=?", (schema["id"],))
-        for fld in schema.get("fields") or []:
-            c.execute(
-                "INSERT OR REPLACE INTO app_schema_fields (schema_id,key,type,unit,scale,desc) VALUES (?,?,?,?,?,?)",
-                (schema["id"], fld.get("key"), fld.get("type"), fld.get("unit"), fld.get("scale"), fld.get("desc")),
-            )
+        c.executemany(
+            "INSERT OR REPLACE INTO app_schema_fields (schema_id,key,type,unit,scale,desc) VALUES (?,?,?,?,?,?)",
+            [
+                (schema["id"], fld.get("key"), fld.get("type"), fld.get("unit"), fld.get("scale"), fld.get("desc"))
+                for fld in schema.get("fields") or []
+            ],
+        )
 
 
 def import_schemas(items: List[Dict[str, Any]]) -> int:
-    for it in items:
-        if not it or not it.get("name"):
-            continue
-        save_schema({"id": it.get("id"), "name": it.get("name"), "fields": it.get("fields") or []})
+    with transaction():
+        for it in items:
+            if not it or not it.get("name"):
+                continue
+            save_schema({"id": it.get("id"), "name": it.get("name"), "fields": it.get("fields") or []})
     return len(items)
 
 
@@ -312,12 +366,12 @@ def load_device_tables() -> List[Dict[str, Any]]:
 
 def add_tables_bulk(items: List[Dict[str, Any]]) -> None:
     with _conn() as c:
-        for t in items:
-            c.execute(
-                """
-                INSERT OR REPLACE INTO app_device_tables (id,name,schema_id,db_target_id,status,last_migrated_at,schema_hash,mapping_health,device_id)
-                VALUES (?,?,?,?,?,?,?,?,?)
-                """,
+        c.executemany(
+            """
+            INSERT OR REPLACE INTO app_device_tables (id,name,schema_id,db_target_id,status,last_migrated_at,schema_hash,mapping_health,device_id)
+            VALUES (?,?,?,?,?,?,?,?,?)
+            """,
+            [
                 (
                     t["id"],
                     t["name"],
@@ -328,8 +382,10 @@ def add_tables_bulk(items: List[Dict[str, Any]]) -> None:
                     t.get("schemaHash"),
                     t.get("mappingHealth"),
                     t.get("deviceId"),
-                ),
-            )
+                )
+                for t in items
+            ],
+        )
 
 
 def set_table_status(table_id: str, status: str, last_migrated_at: Optional[str]) -> None:
@@ -361,6 +417,15 @@ def set_table_device_binding(table_id: str, device_id: Optional[str]) -> None:
         )
 
 
+def upsert_mappings_bulk(items: List[Tuple[str, Optional[str], Optional[str]]]) -> None:
+    """items: (table_id, device_id, mapping_health) triples."""
+    with _conn() as c:
+        c.executemany(
+            "UPDATE app_device_tables SET device_id=?, mapping_health=? WHERE id=?",
+            [(device_id, health, table_id) for table_id, device_id, health in items],
+        )
+
+
 # ---------- Gateways ----------
 def load_gateways() -> List[Dict[str, Any]]:
     with _conn() as c:
@@ -510,7 +575,7 @@ def set_gateway_health(
     *,
     status: Optional[str] = None,
     last_ping: Optional[Dict[str, Any]] = None,
-    last_tcp: Optional[List[Dict[str, Any]]] = None,
+    last_tcp: Optional[Dict[str, Any]] = None,
 ) -> Optional[Dict[str, Any]]:
     import json as _json
     with _conn() as c:
@@ -524,7 +589,7 @@ def set_gateway_health(
         if last_ping is not None:
             fields.append("last_ping_json=?"); values.append(_json.dumps(last_ping))
         if last_tcp is not None:
-            fields.append("last_tcp_json=?"); values.append(_json.dumps(last_tcp))
+            fields.append("last_tcp_json=?"); values.append(_json.dumps(last_tcp, separators=(",", ":")))
         fields.append("last_test_at=?"); values.append(time_iso())
         sql = f"UPDATE app_gateways SET {', '.join(fields)} WHERE id=?"
         values.append(gid)
@@ -718,6 +783,15 @@ def update_device_status(dev_id: str, *, status: Optional[str], latency_ms: Opti
             (status, latency_ms, last_error, dev_id),
         )
 
+
+def update_device_statuses_bulk(items: List[Tuple[str, Optional[str], Optional[int], Optional[str]]]) -> None:
+    """items: (dev_id, status, latency_ms, last_error) tuples, written in one commit."""
+    with _conn() as c:
+        c.executemany(
+            "UPDATE app_devices SET status=?, latency_ms=?, last_error=? WHERE id=?",
+            [(status, latency_ms, last_error, dev_id) for dev_id, status, latency_ms, last_error in items],
+        )
+
 # ---------- Jobs ----------
 def load_jobs() -> List[Dict[str, Any]]:
     with _conn() as c:
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields as _dc_fields
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class FrozenRows(dict):
+    """Mapping rows shared by a published Store snapshot.
+
+    A dict (so JSON/pydantic serialize it as-is) that refuses mutation;
+    get_mapping hands it out without copying. Copy with dict(rows) to edit.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> Any:
+        raise TypeError("mapping rows are read-only; copy with dict(rows) to edit")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+def _slotted(cls: type) -> type:
+    """Rebuild a dataclass with __slots__ for its fields.
+
+    Same result as @dataclass(slots=True), which needs Python 3.10; the
+    agent still supports 3.9. Apply it outside @dataclass.
+    """
+    names = tuple(f.name for f in _dc_fields(cls))
+    ns = dict(cls.__dict__)
+    # Field defaults live in the generated __init__; the class attributes
+    # would clash with the slot descriptors
+    for name in names:
+        ns.pop(name, None)
+    ns.pop("__dict__", None)
+    ns.pop("__weakref__", None)
+    ns["__slots__"] = names
+    new_cls = type(cls)(cls.__name__, cls.__bases__, ns)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+class _Record(Mapping):
+    """Read-only dict view over a slotted record.
+
+    Store code uses attribute access; routers and appdb keep using
+    rec.get("key") / rec["key"] / {**rec} unchanged. FastAPI serializes the
+    dataclass directly; use to_dict() where a real dict is needed.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__dataclass_fields__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__dataclass_fields__:
+            return getattr(self, key)
+        return default
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__dataclass_fields__)
+
+    def __len__(self) -> int:
+        return len(self.__dataclass_fields__)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.__dataclass_fields__}
+
+    @classmethod
+    def from_mapping(cls, d: Mapping) -> Any:
+        names = cls.__dataclass_fields__
+        return cls(**{k: v for k, v in d.items() if k in names})
+
+
+@_slotted
+@dataclass
+class SchemaRec(_Record):
+    id: str
+    name: str
+    fields: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class _NamedRecord(_Record):
+    # Lowercased name cached outside the dataclass fields (not serialized)
+    __slots__ = ("_name_lc",)
+
+
+@_slotted
+@dataclass
+class TableRec(_NamedRecord):
+    id: str
+    name: str
+    schemaId: Optional[str] = None
+    dbTargetId: Optional[str] = None
+    status: str = "not_migrated"
+    lastMigratedAt: Optional[str] = None
+    mappingHealth: Optional[str] = None
+    deviceId: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        self._name_lc = (self.name or "").lower()
+
+
+@_slotted
+@dataclass
+class DeviceRec(_Record):
+    id: str
+    name: str
+    protocol: str = "modbus"
+    status: str = "disconnected"
+    latencyMs: Optional[int] = None
+    lastError: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    autoReconnect: bool = True
+
+
+@_slotted
+@dataclass
+class GatewayRec(_Record):
+    id: str
+    name: str
+    host: str
+    adapterId: Optional[str] = None
+    nic_hint: Optional[str] = None
+    ports: List[int] = field(default_factory=list)
+    protocol_hint: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    status: str = "unknown"
+    last_ping: Optional[Dict[str, Any]] = None
+    # {"open_ports": [...], "scanned_ports": [...], "ts": ms}; older rows may hold a per-port list
+    last_tcp: Optional[Any] = None
+    # Present once the record has been synced from the App DB row
+    adapter_id: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    last_test_at: Optional[str] = None
+
+
+@_slotted
+@dataclass
+class JobRec(_Record):
+    id: str
+    name: str
+    type: str = "continuous"
+    tables: List[str] = field(default_factory=list)
+    columns: Any = "all"
+    intervalMs: int = 1000
+    enabled: bool = False
+    status: str = "stopped"
+    batching: Dict[str, Any] = field(default_factory=dict)
+    cpuBudget: str = "balanced"
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    triggers: List[Dict[str, Any]] = field(default_factory=list)
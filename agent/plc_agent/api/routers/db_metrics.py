@@ -57,8 +57,8 @@ def db_metrics(target_id: Optional[str] = Query(None), range: Optional[str] = Qu
         if not relevant:
             continue
         # approx: use job write latencies
-        w_lat.extend(list(jm.write_lat_ms)[-600:])
         ts = jm.timeseries(window_secs)
+        w_lat.extend(jm.recent_write_latencies(600))
         for s in ts:
             writes += int(s.get("writes") or 0)
             w_err += int(s.get("writeErrors") or 0)
@@ -533,11 +533,11 @@ def job_runs(job_id: str, frm: Optional[str] = None, to: Optional[str] = None) -
 @router.get("/{job_id}/errors")
 def job_errors(job_id: str, frm: Optional[str] = None, to: Optional[str] = None) -> Dict[str, Any]:
     # For now, return in-memory aggregated error counts with last message
-    from ...metrics import metrics as METRICS
+    from ...metrics import metrics as METRICS, wall_ts
     jm = METRICS.get_job(job_id)
     errs = []
-    for code, (cnt, last_msg, last_ts) in jm.errors.items():
-        errs.append({"code": code, "count": cnt, "lastMessage": last_msg, "lastTs": int(last_ts)})
+    for code, cnt, last_msg, last_ts in jm.error_rows():
+        errs.append({"code": code, "count": cnt, "lastMessage": last_msg, "lastTs": wall_ts(last_ts)})
     return {"ok": True, "data": errs}
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, HTTPException
 import logging
@@ -509,6 +509,71 @@ def _replace_mapping_in_user_db(table: Dict[str, Any], rows: Dict[str, Dict[str,
             )
 
 
+def _load_mappings_bulk(target_id: Optional[str], tables: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Load mappings for many tables sharing one User DB target.
+
+    Same lookup rules as _load_mapping_from_user_db (logical name first, then the
+    prefixed physical name) but one engine, one mapping-table probe and one
+    SELECT per chunk of names. Returns tableId -> {deviceId, rows} for tables
+    that have at least one mapping row.
+    """
+    out: Dict[str, Dict[str, Any]] = {}
+    if not tables:
+        return out
+    try:
+        engine = _engine_for_target_id(target_id)
+        m_table = _select_mapping_table(engine, create=False)
+        names: Dict[str, tuple] = {}
+        for t in tables:
+            logical = t.get("name")
+            if logical:
+                names[t.get("id")] = (logical, _device_ident(engine, logical)["name"])
+        wanted = sorted({n for pair in names.values() for n in pair})
+        by_name: Dict[str, List[Any]] = {}
+        with engine.connect() as conn:
+            # Chunk to stay under SQLite's bound-parameter limit
+            for i in range(0, len(wanted), 500):
+                chunk = wanted[i:i + 500]
+                params = {f"n{j}": n for j, n in enumerate(chunk)}
+                placeholders = ",".join(f":n{j}" for j in range(len(chunk)))
+                try:
+                    rs = conn.execute(
+                        text(f"SELECT table_name,field_key,protocol,address,data_type,scale,deadband,device_id FROM {m_table} WHERE table_name IN ({placeholders})"),
+                        params,
+                    ).fetchall()
+                except Exception:
+                    rs = []
+                for r in rs:
+                    by_name.setdefault(r[0], []).append(r)
+        for tid, (logical, prefixed) in names.items():
+            rows = by_name.get(logical) or by_name.get(prefixed) or []
+            if not rows:
+                continue
+            dev_id = next((r[7] for r in rows if r[7]), None)
+            item: Dict[str, Any] = {
+                "deviceId": dev_id if dev_id is not None else Store.instance().get_mapping(tid).get("deviceId"),
+                "rows": {},
+            }
+            for r in rows:
+                if not r[1]:
+                    continue
+                item["rows"][r[1]] = {
+                    "protocol": r[2],
+                    "address": r[3],
+                    "dataType": r[4],
+                    "scale": r[5],
+                    "deadband": r[6],
+                }
+            out[tid] = item
+        try:
+            log.info(f"mappings._load_bulk: target={target_id} m_table={m_table} tables={len(tables)} loaded={len(out)}")
+        except Exception:
+            pass
+    except Exception:
+        pass
+    return out
+
+
 def _load_mapping_from_user_db(table: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     try:
         engine = _engine_for_target_id(table.get("dbTargetId"))
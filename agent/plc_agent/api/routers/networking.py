@@ -265,8 +265,13 @@ def tcp_gateway(gid: str, params: Dict[str, Any]) -> Dict[str, Any]:
     host = gw.get("host")
     ports = params.get("ports") or gw.get("ports") or []
     results: List[Dict[str, Any]] = []
+    open_ports: List[int] = []
     for p in ports:
         r = tcp_test({"host": host, "port": p, "timeoutMs": params.get("timeoutMs", 1000)})
         results.append({"port": p, **r})
-    Store.instance().set_gateway_health(gid, last_tcp=results)
+        if r.get("status") == "open":
+            open_ports.append(p)
+    # Persist the compact form; the full per-port results go back to the caller
+    last_tcp = {"open_ports": open_ports, "scanned_ports": list(ports), "ts": int(time.time() * 1000)}
+    Store.instance().set_gateway_health(gid, last_tcp=last_tcp)
     return {"ok": True, "results": results}
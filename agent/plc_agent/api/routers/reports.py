@@ -7,7 +7,7 @@ from typing import Dict, Any, Optional
 from fastapi import APIRouter, Response, Query
 
 from .. import appdb
-from ...metrics import metrics as METRICS
+from ...metrics import metrics as METRICS, wall_ts
 
 
 router = APIRouter(prefix="/reports")
@@ -48,8 +48,8 @@ def export_errors(job_id: Optional[str] = Query(None)) -> Response:
         jids = list(METRICS.jobs.keys())  # type: ignore[attr-defined]
     for jid in jids:
         jm = METRICS.get_job(jid)
-        for code, (cnt, last_msg, last_ts) in jm.errors.items():
-            w.writerow([jid, code, cnt, last_msg, int(last_ts)])
+        for code, cnt, last_msg, last_ts in jm.error_rows():
+            w.writerow([jid, code, cnt, last_msg, wall_ts(last_ts)])
     data = buf.getvalue()
     return Response(content=data, media_type="text/csv")
 
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/storage")
 def list_targets() -> Dict[str, Any]:
     # Internal structure kept in store; expose safe metadata
     items = []
-    for v in Store.instance()._db_targets.values():  # type: ignore[attr-defined]
+    for v in Store.instance().list_db_targets():
         items.append({"id": v.get("id"), "provider": v.get("provider"), "conn": v.get("conn"), "status": v.get("status"), "lastMsg": v.get("lastMsg")})
     return {"items": items, "defaultId": Store.instance().get_default_db_target()}
 
@@ -31,10 +31,9 @@ def add_target(payload: Dict[str, Any]) -> Dict[str, Any]:
 
 @router.put("/targets/{tid}")
 def update_target(tid: str, patch: Dict[str, Any]) -> Dict[str, Any]:
-    cur = Store.instance().get_db_target(tid)
+    cur = Store.instance().update_db_target(tid, patch)
     if not cur:
         raise HTTPException(status_code=404, detail="not_found")
-    cur.update({k: v for k, v in patch.items() if k in ("provider", "conn", "status", "lastMsg")})
     return {"success": True, "item": cur}
 
 
@@ -54,7 +53,7 @@ def delete_target(tid: str, force: bool = False) -> Dict[str, Any]:
         # Policy 1 (block)
         raise HTTPException(status_code=400, detail="TARGET_IN_USE")
     # Remove
-    st._db_targets.pop(tid, None)  # type: ignore[attr-defined]
+    st.delete_db_target(tid)
     appdb.delete_target(tid)
     return {"success": True}
 
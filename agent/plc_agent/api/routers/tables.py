@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+import threading
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, List, Optional
 
@@ -8,6 +9,7 @@ from fastapi import APIRouter, HTTPException, Query
 
 from sqlalchemy import (
     create_engine,
+    event,
     MetaData,
     Table,
     Column,
@@ -30,6 +32,10 @@ log = logging.getLogger(__name__)
 
 SQLITE_FALLBACK_URL = "sqlite:///mydatabase.db"
 
+# One engine (and connection pool) per User DB URL, shared by all routers
+_ENGINES: Dict[str, Any] = {}
+_ENGINES_LOCK = threading.Lock()
+
 
 def _expand_pattern(name_or_pattern: str) -> List[str]:
     m = re.match(r"^(.*)\{(\d+)\.\.(\d+)\}(.*)$", name_or_pattern or "")
@@ -63,7 +69,26 @@ def _engine_for_target(target_id: Optional[str]):
                 url = f"sqlite:///{p.as_posix()}"
             except Exception:
                 url = f"sqlite:///{conn}"
-    return create_engine(url)
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(url)
+        if engine is None:
+            engine = create_engine(url)
+            if url.startswith("sqlite") and ":memory:" not in url:
+                event.listen(engine, "connect", _sqlite_on_connect)
+            _ENGINES[url] = engine
+    return engine
+
+
+def _sqlite_on_connect(dbapi_conn, _record) -> None:
+    # Same tuning as the App DB: WAL so job writers don't block mapping reads
+    try:
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA busy_timeout=5000")
+        cur.close()
+    except Exception:
+        pass
 
 
 def _to_sa_type(ftype: str):
@@ -246,30 +271,20 @@ def list_tables(
         phys_logical.append(logical)
     phys_set = set(phys_logical)
 
-    # Build response: keep unmigrated; keep migrated only if physically present
+    # Keep unmigrated; keep migrated only if physically present
+    listed = [
+        t for t in base
+        if (t.get("status") or "").lower() != "migrated" or t.get("name") in phys_set
+    ]
+    # Ensure mapping rows are hydrated from User DB so status reflects saved mapping
+    _hydrate_mappings(listed, "tables.list", bind=True)
+
+    # Build response
     out: List[Dict[str, Any]] = []
     names_out: set[str] = set()
-    for t in base:
-        st = (t.get("status") or "").lower()
-        if st == "migrated" and t.get("name") not in phys_set:
-            continue
+    for t in listed:
         schema = Store.instance().get_schema(t.get("schemaId")) or {"fields": []}
         fields = schema.get("fields") or []
-        # Ensure mapping rows are hydrated from User DB so status reflects saved mapping
-        try:
-            from . import mappings as _mp  # local import to avoid cycles
-            loaded = _mp._load_mapping_from_user_db(t)  # type: ignore[attr-defined]
-            if loaded and (loaded.get("rows") or {}):
-                Store.instance().replace_mapping(t.get("id"), {"deviceId": loaded.get("deviceId"), "rows": loaded.get("rows") or {}})
-                # Ensure table device binding is set when available
-                if loaded.get("deviceId"):
-                    Store.instance().set_table_device_binding(t.get("id"), loaded.get("deviceId"))
-                try:
-                    log.info(f"tables.list: table={t.get('id')} name={t.get('name')} loaded_rows={len((loaded.get('rows') or {}))}")
-                except Exception:
-                    pass
-        except Exception:
-            pass
         mapping = Store.instance().get_mapping(t.get("id"))
         mapping_exists = bool((mapping.get("rows") or {}))
         required_keys = [f.get("key") for f in fields]
@@ -310,6 +325,42 @@ def list_tables(
     return {"success": True, "total": total, "page": page, "items": out[start:end]}
 
 
+def _hydrate_mappings(tables: List[Dict[str, Any]], tag: str, *, bind: bool = False) -> None:
+    """Sync saved mapping rows from the User DB into the Store.
+
+    All User DB reads happen first; the Store updates then share one App DB
+    transaction (Store.batch) instead of committing per table.
+    """
+    from . import mappings as _mp  # local import to avoid cycles
+    loaded_by_id: Dict[str, Dict[str, Any]] = {}
+    for t in tables:
+        try:
+            loaded = _mp._load_mapping_from_user_db(t)  # type: ignore[attr-defined]
+            if loaded and (loaded.get("rows") or {}):
+                loaded_by_id[t.get("id")] = loaded
+        except Exception:
+            pass
+    if not loaded_by_id:
+        return
+    store = Store.instance()
+    with store.batch():
+        for t in tables:
+            loaded = loaded_by_id.get(t.get("id"))
+            if loaded is None:
+                continue
+            try:
+                store.replace_mapping(t.get("id"), {"deviceId": loaded.get("deviceId"), "rows": loaded.get("rows") or {}})
+                # Ensure table device binding is set when available
+                if bind and loaded.get("deviceId"):
+                    store.set_table_device_binding(t.get("id"), loaded.get("deviceId"))
+                try:
+                    log.info(f"{tag}: table={t.get('id')} name={t.get('name')} loaded_rows={len((loaded.get('rows') or {}))}")
+                except Exception:
+                    pass
+            except Exception:
+                pass
+
+
 @router.get("/discover")
 def discover(
     dbTargetId: Optional[str] = Query(None),
@@ -336,24 +387,14 @@ def discover(
                 phys_logical.append(p[len(NEURACT_PREFIX):] if p.startswith(NEURACT_PREFIX) else p)
             phys_set = set(phys_logical)
             # Keep only local migrated that exist physically
-            for t in local_migrated:
-                if t.get("name") in phys_set:
-                    # Hydrate mapping rows for correct status
-                    try:
-                        from . import mappings as _mp  # local import to avoid cycles
-                        loaded = _mp._load_mapping_from_user_db(t)  # type: ignore[attr-defined]
-                        if loaded and (loaded.get("rows") or {}):
-                            Store.instance().replace_mapping(t.get("id"), {"deviceId": loaded.get("deviceId"), "rows": loaded.get("rows") or {}})
-                            try:
-                                log.info(f"tables.discover: table={t.get('id')} name={t.get('name')} loaded_rows={len((loaded.get('rows') or {}))}")
-                            except Exception:
-                                pass
-                    except Exception:
-                        pass
-                    # Also include mapping rows in payload
-                    mapping = Store.instance().get_mapping(t.get("id"))
-                    t_with_map = {**t, "mappingRows": mapping.get("rows") or {}}
-                    migrated.append(t_with_map)
+            present = [t for t in local_migrated if t.get("name") in phys_set]
+            # Hydrate mapping rows for correct status
+            _hydrate_mappings(present, "tables.discover")
+            for t in present:
+                # Also include mapping rows in payload
+                mapping = Store.instance().get_mapping(t.get("id"))
+                t_with_map = {**t, "mappingRows": mapping.get("rows") or {}}
+                migrated.append(t_with_map)
             # Append extra discovered that are not in local catalog
             have_local_names = {t.get("name") for t in migrated}
             for ln in phys_logical:
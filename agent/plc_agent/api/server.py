@@ -1,20 +1,34 @@
 import json
 import os
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from collections.abc import Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 
 _USE_UVICORN = os.environ.get("AGENT_USE_UVICORN", "1") not in ("0", "false", "False")
 
+def _json_default(o):
+    # Store records (records.py) are read-only Mappings
+    if isinstance(o, Mapping):
+        return dict(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
 class _Handler(BaseHTTPRequestHandler):
     server_version = "PLCLoggerAgent/0.1"
+    # Keep-alive: the UI reuses one connection for its dashboard polls
+    protocol_version = "HTTP/1.1"
+    # Buffer wfile so status line, headers and body leave in a single send;
+    # handle_one_request() flushes it after every request
+    wbufsize = 64 * 1024
 
     def _cors_origin(self) -> str:
         return os.environ.get("CORS_ORIGIN") or "http://127.0.0.1:5173"
 
-    def _set_json(self, status=200):
+    def _set_json(self, status=200, length=0):
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(length))
         self.send_header("Cache-Control", "no-store")
         # CORS headers for fallback server
         self.send_header("Access-Control-Allow-Origin", self._cors_origin())
@@ -23,6 +37,11 @@ class _Handler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Methods", "GET,POST,PUT,DELETE,OPTIONS")
         self.end_headers()
 
+    def _send_json(self, status, body):
+        data = json.dumps(body, default=_json_default).encode("utf-8")
+        self._set_json(status, len(data))
+        self.wfile.write(data)
+
     def log_message(self, fmt, *args):
         return
 
@@ -38,12 +57,8 @@ class _Handler(BaseHTTPRequestHandler):
         return hdr == token
 
     def do_OPTIONS(self):
-        # Preflight CORS
+        # Preflight CORS (204 carries no body)
         self._set_json(204)
-        try:
-            self.wfile.write(b"{}")
-        except Exception:
-            pass
 
     def do_GET(self):
         path = urlparse(self.path).path
@@ -51,8 +66,7 @@ class _Handler(BaseHTTPRequestHandler):
         if path == "/auth/handshake":
             tok = os.environ.get("AGENT_TOKEN") or ""
             port = int(os.environ.get("AGENT_PORT", "0") or 0)
-            self._set_json(200)
-            self.wfile.write(json.dumps({"token": tok, "port": port}).encode("utf-8"))
+            self._send_json(200, {"token": tok, "port": port})
             return
         if path == "/health":
             body = {
@@ -60,13 +74,11 @@ class _Handler(BaseHTTPRequestHandler):
                 "agent": "plc-agent",
                 "version": "0.1.0",
             }
-            self._set_json(200)
-            self.wfile.write(json.dumps(body).encode("utf-8"))
+            self._send_json(200, body)
             return
         # Authenticated paths follow
         if not self._is_authorized():
-            self._set_json(401)
-            self.wfile.write(json.dumps({"success": False, "error": "PERMISSION_DENIED", "message": "Missing or invalid token"}).encode("utf-8"))
+            self._send_json(401, {"success": False, "error": "PERMISSION_DENIED", "message": "Missing or invalid token"})
             return
         try:
             if path == "/devices":
@@ -74,36 +86,34 @@ class _Handler(BaseHTTPRequestHandler):
                 from .appdb import init as _init
                 _init(); Store.instance().load_from_app_db()
                 items = Store.instance().list_devices()
-                self._set_json(200)
-                self.wfile.write(json.dumps({"items": items}).encode("utf-8"))
+                self._send_json(200, {"items": items})
                 return
             if path == "/storage/targets":
                 from .appdb import load_targets as _load
                 tgs, default_id = _load()
-                self._set_json(200)
-                self.wfile.write(json.dumps({"items": tgs, "defaultId": default_id}).encode("utf-8"))
+                self._send_json(200, {"items": tgs, "defaultId": default_id})
                 return
             if path == "/networking/gateways":
                 from .store import Store
                 from .appdb import init as _init
                 _init(); Store.instance().load_from_app_db()
                 items = Store.instance().list_gateways()
-                self._set_json(200)
-                self.wfile.write(json.dumps({"items": items}).encode("utf-8"))
+                self._send_json(200, {"items": items})
                 return
             if path == "/schemas":
                 from .store import Store
                 from .appdb import init as _init
                 _init(); Store.instance().load_from_app_db()
                 items = Store.instance().list_schemas()
-                self._set_json(200)
-                self.wfile.write(json.dumps({"items": items}).encode("utf-8"))
+                self._send_json(200, {"items": items})
                 return
             if path == "/jobs":
                 from .store import Store
                 from .appdb import init as _init
                 _init(); Store.instance().load_from_app_db()
                 items = Store.instance().list_jobs()
+                self._send_json(200, {"items": items})
+                return
             if path == "/system/summary":
                 try:
                     from .store import Store
@@ -119,22 +129,15 @@ class _Handler(BaseHTTPRequestHandler):
                         default_ok = bool(t and (t.get("status") == "ok"))
                     jobs = st.list_jobs()
                     running = sum(1 for j in jobs if (j.get("status") or "").lower() == "running")
-                    self._set_json(200)
-                    self.wfile.write(json.dumps({"ok": True, "devicesConnected": connected, "defaultDbOk": default_ok, "jobsRunning": running}).encode("utf-8"))
+                    self._send_json(200, {"ok": True, "devicesConnected": connected, "defaultDbOk": default_ok, "jobsRunning": running})
                     return
                 except Exception as e:
-                    self._set_json(500)
-                    self.wfile.write(json.dumps({"error":"internal_error","message":str(e)}).encode("utf-8"))
+                    self._send_json(500, {"error":"internal_error","message":str(e)})
                     return
-                self._set_json(200)
-                self.wfile.write(json.dumps({"items": items}).encode("utf-8"))
-                return
         except Exception as e:
-            self._set_json(500)
-            self.wfile.write(json.dumps({"error": "internal_error", "message": str(e)}).encode("utf-8"))
+            self._send_json(500, {"error": "internal_error", "message": str(e)})
             return
-        self._set_json(404)
-        self.wfile.write(json.dumps({"error": "not_found"}).encode("utf-8"))
+        self._send_json(404, {"error": "not_found"})
 
     def do_POST(self):
         path = urlparse(self.path).path
@@ -148,32 +151,26 @@ class _Handler(BaseHTTPRequestHandler):
             if path == "/auth/handshake":
                 tok = os.environ.get("AGENT_TOKEN") or ""
                 port = int(os.environ.get("AGENT_PORT", "0") or 0)
-                self._set_json(200)
-                self.wfile.write(json.dumps({"token": tok, "port": port}).encode("utf-8"))
+                self._send_json(200, {"token": tok, "port": port})
                 return
             # Auth required beyond this point
             if not self._is_authorized():
-                self._set_json(401)
-                self.wfile.write(json.dumps({"success": False, "error": "PERMISSION_DENIED", "message": "Missing or invalid token"}).encode("utf-8"))
+                self._send_json(401, {"success": False, "error": "PERMISSION_DENIED", "message": "Missing or invalid token"})
                 return
             if path == "/networking/ping":
                 t0 = time.perf_counter(); time.sleep(0.05)
                 dt = int((time.perf_counter() - t0) * 1000)
                 out = {"ok": False, "lossPct": 100, "min": 0, "avg": 0, "max": 0, "samples": [], "timeMs": dt}
-                self._set_json(200)
-                self.wfile.write(json.dumps(out).encode("utf-8"))
+                self._send_json(200, out)
                 return
             if path == "/networking/tcp_test":
                 out = {"status": "timeout", "timeMs": 0}
-                self._set_json(200)
-                self.wfile.write(json.dumps(out).encode("utf-8"))
+                self._send_json(200, out)
                 return
         except Exception as e:
-            self._set_json(500)
-            self.wfile.write(json.dumps({"error": "internal_error", "message": str(e)}).encode("utf-8"))
+            self._send_json(500, {"error": "internal_error", "message": str(e)})
             return
-        self._set_json(404)
-        self.wfile.write(json.dumps({"error": "not_found"}).encode("utf-8"))
+        self._send_json(404, {"error": "not_found"})
 
 def run(host: str = "127.0.0.1", port: int = 5175):
     if _USE_UVICORN:
@@ -188,11 +185,14 @@ def run(host: str = "127.0.0.1", port: int = 5175):
         except Exception as e:
             print("❌ Error starting uvicorn:", e)
             raise  # ✅ Re-raise unless fallback is really wanted
-    httpd = HTTPServer((host, port), _Handler)
+    httpd = ThreadingHTTPServer((host, port), _Handler)
     try:
         httpd.serve_forever()
     finally:
         httpd.server_close()
+        # Same shutdown step as the FastAPI app: persist queued device statuses
+        from .store import Store
+        Store.instance().stop_device_reconnector()
 
 
 if __name__ == "__main__":
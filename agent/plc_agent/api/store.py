@@ -1,11 +1,158 @@
 from __future__ import annotations
 
+import itertools
+import queue
+import random
+import socket
+import sys
 import threading
 import time
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from types import MappingProxyType
+from typing import Dict, Any, Iterable, Iterator, List, Mapping, Optional, Tuple
 import logging
 
 from . import appdb
+from .records import DeviceRec, FrozenRows, GatewayRec, JobRec, SchemaRec, TableRec
+
+# OPC UA client is optional; resolved once so connect attempts only time the connect
+try:
+    from opcua import Client as _OPCUA_CLIENT  # type: ignore
+except Exception:
+    _OPCUA_CLIENT = None
+
+
+_NO_ROWS = FrozenRows()
+
+# Enumerated values are stored interned and lowercased (see _intern_lc), so hot
+# paths can compare them by identity
+PROTO_OPCUA = sys.intern("opcua")
+PROTO_MODBUS = sys.intern("modbus")
+PROVIDER_SQLITE = sys.intern("sqlite")
+JOB_CONTINUOUS = sys.intern("continuous")
+JOB_TRIGGER = sys.intern("trigger")
+STATUS_CONNECTED = sys.intern("connected")
+STATUS_DISCONNECTED = sys.intern("disconnected")
+STATUS_RECONNECTING = sys.intern("reconnecting")
+
+# Reconnect delay (s) after the n-th consecutive failure: x1.7 per attempt, capped at 30
+_BACKOFF_LADDER: Tuple[float, ...] = tuple(min(30.0, 1.7 ** n) for n in range(8))
+_BACKOFF_MAX = len(_BACKOFF_LADDER) - 1
+
+
+def _intern_lc(raw: Any) -> str:
+    return sys.intern(str(raw).strip().lower())
+
+
+def _norm_rows(rows: Mapping[str, Any]) -> FrozenRows:
+    # Mapping rows as published: protocol lowercased + interned
+    out = {}
+    for k, r in rows.items():
+        if r and r.get("protocol"):
+            r = {**r, "protocol": _intern_lc(r["protocol"])}
+        out[k] = r
+    return FrozenRows(out)
+
+
+def _cow_put(m: Mapping[str, Any], key: str, value: Any) -> Mapping[str, Any]:
+    d = dict(m)
+    d[key] = value
+    return MappingProxyType(d)
+
+
+def _cow_pop(m: Mapping[str, Any], key: str) -> Mapping[str, Any]:
+    d = dict(m)
+    d.pop(key, None)
+    return MappingProxyType(d)
+
+
+_mappings_mod: Any = None
+
+
+def _mappings_router() -> Any:
+    # routers.mappings imports Store (and FastAPI/SQLAlchemy), so it cannot be
+    # imported at module load; resolve it once and remember a failed import
+    global _mappings_mod
+    if _mappings_mod is None:
+        try:
+            from .routers import mappings as mod
+        except ImportError:
+            mod = False
+        _mappings_mod = mod
+    return _mappings_mod or None
+
+
+def _now_ms() -> int:
+    # Millisecond id stamps without the float round-trip
+    return time.time_ns() // 1_000_000
+
+
+def _lc(s: Any) -> str:
+    return str(s or "").lower()
+
+
+def _lc_index(pairs: Iterable[Tuple[str, str]]) -> Mapping[str, str]:
+    # lowercase key -> id; the first record wins, matching the old linear scans
+    d: Dict[str, str] = {}
+    for key, rid in pairs:
+        d.setdefault(key, rid)
+    return MappingProxyType(d)
+
+
+def _reindex(idx: Mapping[str, str], old_key: Optional[str], new_key: Optional[str], rid: str) -> Mapping[str, str]:
+    # Move rid from old_key to new_key in a lowercase index (copy-on-write)
+    if old_key == new_key:
+        return idx
+    d = dict(idx)
+    if old_key is not None and d.get(old_key) == rid:
+        del d[old_key]
+    if new_key is not None:
+        d.setdefault(new_key, rid)
+    return MappingProxyType(d)
+
+
+def _clean_ports(ports: Iterable[Any]) -> List[int]:
+    # One int() per entry; out-of-range ports are dropped, non-numeric ones rejected
+    clean = set()
+    add = clean.add
+    for p in ports:
+        try:
+            v = int(p)
+        except (TypeError, ValueError):
+            raise ValueError("INVALID_PORTS")
+        if 0 < v <= 65535:
+            add(v)
+    return sorted(clean)
+
+
+def _compute_health(rows: Mapping[str, Any], required_fields: tuple) -> str:
+    if not rows:
+        return "Unmapped"
+    # If no schema is defined (no required fields), treat any mapping as Mapped
+    if not required_fields:
+        return "Mapped"
+    ok = 0
+    get = rows.get
+    for f in required_fields:
+        r = get(f)
+        if not r:
+            continue
+        rget = r.get
+        p = rget("protocol")
+        if p is PROTO_OPCUA:
+            if rget("address") or rget("nodeId"):
+                ok += 1
+        elif p is PROTO_MODBUS:
+            if rget("address") and rget("dataType"):
+                ok += 1
+        # unknown protocol, do not count
+    if ok == 0:
+        return "Unmapped"
+    if ok == len(required_fields):
+        return "Mapped"
+    return "Partially Mapped"
 
 
 class Store:
@@ -13,157 +160,231 @@ class Store:
     _lock = threading.Lock()
 
     def __init__(self) -> None:
-        self._mtx = threading.RLock()
-        self._schemas: List[Dict[str, Any]] = []
-        self._jobs: List[Dict[str, Any]] = []
+        self._mtx = threading.Lock()
+        # Read-mostly collections live in one immutable snapshot. Readers load
+        # self._state without locking; writers copy the sub-map they change under
+        # _write_mtx and publish a new snapshot with a single assignment.
+        # Records inside a published snapshot are never mutated in place.
+        self._write_mtx = threading.Lock()
+        # Serializes App DB writes so threads queue here rather than spinning on
+        # SQLITE_BUSY; reentrant so Store writes can run inside batch()
+        self._appdb_write_lock = threading.RLock()
+        self._state: Mapping[str, Any] = MappingProxyType({
+            "schemas_by_id": MappingProxyType({}),
+            "tables_by_id": MappingProxyType({}),
+            # mappings: tableId -> { deviceId: str|None, rows: { fieldKey: {protocol,address,dataType,scale,deadband} } }
+            "mappings_by_table": MappingProxyType({}),
+            # Saved devices
+            "devices_by_id": MappingProxyType({}),
+            # Saved gateways (reachability)
+            "gateways_by_id": MappingProxyType({}),
+            # Lowercase name/host -> id, for case-insensitive dedupe without scans
+            "device_names_lc": MappingProxyType({}),
+            "gateway_names_lc": MappingProxyType({}),
+            "gateway_hosts_lc": MappingProxyType({}),
+        })
+        # tableId -> (mapping entry, required fields, health). Entries are replaced,
+        # never mutated, so an identity check on the entry is enough to validate
+        self._health_cache: Dict[str, Tuple[Any, tuple, str]] = {}
+        self._jobs_by_id: Dict[str, Dict[str, Any]] = {}
         self._db_targets: Dict[str, Dict[str, Any]] = {}
+        # (provider, conn) lowercased -> target id
+        self._db_target_key_index: Dict[Tuple[str, str], str] = {}
         self._default_db_target_id: Optional[str] = None
-        # Device tables & mappings
-        self._tables: List[Dict[str, Any]] = []
-        # mappings: tableId -> { deviceId: str|None, rows: { fieldKey: {protocol,address,dataType,scale,deadband} } }
-        self._mappings: Dict[str, Dict[str, Any]] = {}
         # simple migration history (append-only)
         self._migrations: List[Dict[str, Any]] = []
-        # Saved devices
-        self._devices: Dict[str, Dict[str, Any]] = {}
-        # Saved gateways (reachability)
-        self._gateways: List[Dict[str, Any]] = []
         # Rate limit tests per gateway id
         self._gw_rate: Dict[str, float] = {}
-        # Device reconnect loop state
-        self._dev_backoff: Dict[str, Dict[str, Any]] = {}
+        # Device reconnect loop state: per-device (failed attempts, next_at monotonic)
+        self._dev_backoff: Dict[str, Tuple[int, float]] = {}
+        self._dev_inflight: set = set()
+        self._dev_stop = threading.Event()
+        # Set to make the reconnect loop rescan before its next backoff expiry
+        self._reconnect_event = threading.Event()
+        self._reconnect_executor: Optional[ThreadPoolExecutor] = None
         self._dev_thread: Optional[threading.Thread] = None
         self._dev_thread_started: bool = False
+        # Device status writes are queued and flushed to the App DB in batches
+        self._status_q: "queue.SimpleQueue[Tuple[str, Optional[str], Optional[int], Optional[str]]]" = queue.SimpleQueue()
+        self._status_pending = threading.Event()
+        self._status_flush_lock = threading.Lock()
+        self._status_flusher: Optional[threading.Thread] = None
+        # Write generation: bumped on every in-memory change so pollers can skip
+        # re-reading when it has not moved. next() on a count is atomic, so
+        # writers under either lock can share it
+        self._gen = itertools.count(1)
+        self._version: int = 0
+        # Suffix for table ids minted in the same millisecond
+        self._table_seq = itertools.count(1)
         # Logger
         self._log = logging.getLogger(__name__)
 
     @classmethod
     def instance(cls) -> "Store":
+        # Fast path without the lock; the singleton is published by one assignment
+        inst = cls._inst
+        if inst is not None:
+            return inst
         with cls._lock:
             if cls._inst is None:
                 cls._inst = Store()
             return cls._inst
 
+    @contextmanager
+    def batch(self) -> Iterator["Store"]:
+        """Commit all App DB writes made by Store calls in this block at once."""
+        with self._appdb_write_lock, appdb.transaction():
+            yield self
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _bump(self) -> None:
+        self._version = next(self._gen)
+
+    def _publish(self, **changes: Any) -> None:
+        # Caller must hold _write_mtx
+        st = dict(self._state)
+        st.update(changes)
+        self._state = MappingProxyType(st)
+        self._bump()
+
     # ---------------- Schemas ----------------
     def list_schemas(self) -> List[Dict[str, Any]]:
-        with self._mtx:
-            return list(self._schemas)
+        return list(self._state["schemas_by_id"].values())
 
     def create_schema(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         name = (payload.get("name") or "").strip()
         if not name:
             raise ValueError("name required")
-        schema = {
-            "id": payload.get("id") or f"sch_{int(time.time()*1000)}",
-            "name": name,
-            "fields": payload.get("fields") or [],
-        }
-        with self._mtx:
-            # Persist to App Local DB
+        schema = SchemaRec(
+            id=payload.get("id") or f"sch_{_now_ms()}",
+            name=name,
+            fields=payload.get("fields") or [],
+        )
+        # Persist to App Local DB
+        with self._appdb_write_lock:
             appdb.save_schema(schema)
-            self._schemas = appdb.load_schemas()
+        schemas = appdb.load_schemas()
+        with self._write_mtx:
+            self._publish(schemas_by_id=MappingProxyType({s["id"]: SchemaRec.from_mapping(s) for s in schemas}))
         return schema
 
     def import_schemas(self, items: List[Dict[str, Any]]) -> int:
         if not isinstance(items, list):
             return 0
-        with self._mtx:
+        with self._appdb_write_lock:
             appdb.import_schemas(items)
-            self._schemas = appdb.load_schemas()
+        schemas = appdb.load_schemas()
+        with self._write_mtx:
+            self._publish(schemas_by_id=MappingProxyType({s["id"]: SchemaRec.from_mapping(s) for s in schemas}))
         return len(items)
 
     def get_schema(self, schema_id: str) -> Optional[Dict[str, Any]]:
-        with self._mtx:
-            return next((s for s in self._schemas if s.get("id") == schema_id), None)
+        return self._state["schemas_by_id"].get(schema_id)
 
     # ---------------- Jobs ----------------
     def list_jobs(self) -> List[Dict[str, Any]]:
         with self._mtx:
-            return list(self._jobs)
+            return list(self._jobs_by_id.values())
 
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         with self._mtx:
-            return next((j for j in self._jobs if j.get("id") == job_id), None)
+            return self._jobs_by_id.get(job_id)
 
     def create_job(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         name = (payload.get("name") or "").strip()
         if not name:
             raise ValueError("name required")
-        jtype = (payload.get("type") or "continuous").strip().lower()
-        if jtype not in ("continuous", "trigger", "triggered"):
+        jtype = _intern_lc(payload.get("type") or JOB_CONTINUOUS)
+        if jtype not in (JOB_CONTINUOUS, JOB_TRIGGER, "triggered"):
             raise ValueError("TYPE_INVALID")
         # Normalize type
         if jtype == "triggered":
-            jtype = "trigger"
+            jtype = JOB_TRIGGER
         tables = payload.get("tables") or []
         if not isinstance(tables, list) or len(tables) == 0:
             raise ValueError("NO_TABLES")
         # Preflight: reject tables with Unmapped status
         for tid in tables:
-            health = self.mapping_health(tid, required_fields=[f.get("key") for f in (self.get_schema(self.get_table(tid).get("schemaId") or "") or {}).get("fields", [])]) if self.get_table(tid) else "Unmapped"
+            health = self.mapping_health(tid) if self.get_table(tid) else "Unmapped"
             if health == "Unmapped":
                 raise ValueError("NO_MAPPED_COLUMNS")
-        job = {
-            "id": payload.get("id") or f"job_{int(time.time()*1000)}",
-            "name": name,
-            "type": jtype,
-            "tables": tables,
-            "columns": payload.get("columns") or "all",
-            "intervalMs": payload.get("intervalMs") or 1000,
-            "enabled": bool(payload.get("enabled", False)),
-            "status": payload.get("status") or "stopped",
-            "batching": payload.get("batching") or {},
-            "cpuBudget": payload.get("cpuBudget") or "balanced",
-            "metrics": payload.get("metrics") or {},
-            "triggers": payload.get("triggers") or [],
-        }
+        job = JobRec(
+            id=payload.get("id") or f"job_{_now_ms()}",
+            name=name,
+            type=jtype,
+            tables=tables,
+            columns=payload.get("columns") or "all",
+            intervalMs=payload.get("intervalMs") or 1000,
+            enabled=bool(payload.get("enabled", False)),
+            status=payload.get("status") or "stopped",
+            batching=payload.get("batching") or {},
+            cpuBudget=payload.get("cpuBudget") or "balanced",
+            metrics=payload.get("metrics") or {},
+            triggers=payload.get("triggers") or [],
+        )
         with self._mtx:
-            self._jobs.append(job)
-            # Persist to App Local DB
+            self._jobs_by_id[job.id] = job
+            self._bump()
+        # Persist to App Local DB
+        with self._appdb_write_lock:
             appdb.upsert_job(job)
         return job
 
     def set_job_status(self, job_id: str, status: str) -> Optional[Dict[str, Any]]:
         with self._mtx:
-            for j in self._jobs:
-                if j.get("id") == job_id:
-                    j["status"] = status
-                    try:
-                        appdb.update_job_status(job_id, status)
-                    except Exception:
-                        pass
-                    return j
-        return None
+            job = self._jobs_by_id.get(job_id)
+            if job is None:
+                return None
+            job.status = status
+            self._bump()
+        try:
+            with self._appdb_write_lock:
+                appdb.update_job_status(job_id, status)
+        except Exception:
+            pass
+        return job
 
     def delete_job(self, job_id: str) -> bool:
         """Remove job from memory and App Local DB. Returns True if deleted."""
         with self._mtx:
-            before = len(self._jobs)
-            self._jobs = [j for j in self._jobs if j.get("id") != job_id]
+            removed = self._jobs_by_id.pop(job_id, None) is not None
+            if removed:
+                self._bump()
         try:
-            ok = appdb.delete_job(job_id)
+            with self._appdb_write_lock:
+                ok = appdb.delete_job(job_id)
         except Exception:
             ok = False
         # ok indicates DB removal; still consider memory removal for response truthiness
-        return ok or (len(self._jobs) < before)
+        return ok or removed
 
     # -------------- DB Targets --------------
     def add_db_target(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        provider = (payload.get("provider") or "").strip() or "sqlite"
+        provider = _intern_lc(payload.get("provider") or "") or PROVIDER_SQLITE
         conn = (payload.get("conn") or "").strip() or ":memory:"
-        tid = payload.get("id") or f"db_{int(time.time()*1000)}"
+        tid = payload.get("id") or f"db_{_now_ms()}"
         item = {"id": tid, "provider": provider, "conn": conn, "status": payload.get("status") or "untested", "lastMsg": payload.get("lastMsg")}
+        key = (provider, conn.lower())
         with self._mtx:
             # Deduplicate by provider+conn
-            for existing in self._db_targets.values():
-                if (existing.get("provider") or "").lower() == provider.lower() and str(existing.get("conn") or "").lower() == conn.lower():
-                    if payload.get("status"):
-                        existing["status"] = payload.get("status")
-                    if payload.get("lastMsg") is not None:
-                        existing["lastMsg"] = payload.get("lastMsg")
-                    appdb.save_target(existing)
-                    return existing
-            self._db_targets[tid] = item
+            existing = self._db_targets.get(self._db_target_key_index.get(key, ""))
+            if existing is not None:
+                if payload.get("status"):
+                    existing["status"] = payload.get("status")
+                if payload.get("lastMsg") is not None:
+                    existing["lastMsg"] = payload.get("lastMsg")
+                item = existing
+            else:
+                old = self._db_targets.get(tid)
+                if old is not None:
+                    self._db_target_key_index.pop((_lc(old.get("provider")), _lc(old.get("conn"))), None)
+                self._db_targets[tid] = item
+                self._db_target_key_index[key] = tid
+            self._bump()
+        with self._appdb_write_lock:
             appdb.save_target(item)
         return item
 
@@ -171,9 +392,41 @@ class Store:
         with self._mtx:
             return self._db_targets.get(tid)
 
+    def list_db_targets(self) -> List[Dict[str, Any]]:
+        with self._mtx:
+            return list(self._db_targets.values())
+
+    def update_db_target(self, tid: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self._mtx:
+            cur = self._db_targets.get(tid)
+            if cur is None:
+                return None
+            old_key = (_lc(cur.get("provider")), _lc(cur.get("conn")))
+            cur.update({k: v for k, v in patch.items() if k in ("provider", "conn", "status", "lastMsg")})
+            new_key = (_lc(cur.get("provider")), _lc(cur.get("conn")))
+            if new_key != old_key:
+                if self._db_target_key_index.get(old_key) == tid:
+                    del self._db_target_key_index[old_key]
+                self._db_target_key_index.setdefault(new_key, tid)
+            self._bump()
+            return cur
+
+    def delete_db_target(self, tid: str) -> bool:
+        with self._mtx:
+            cur = self._db_targets.pop(tid, None)
+            if cur is None:
+                return False
+            key = (_lc(cur.get("provider")), _lc(cur.get("conn")))
+            if self._db_target_key_index.get(key) == tid:
+                del self._db_target_key_index[key]
+            self._bump()
+            return True
+
     def set_default_db_target(self, tid: str) -> None:
         with self._mtx:
             self._default_db_target_id = tid
+            self._bump()
+        with self._appdb_write_lock:
             appdb.set_default_target(tid)
 
     def get_default_db_target(self) -> Optional[str]:
@@ -182,290 +435,352 @@ class Store:
 
     # -------------- Device Tables --------------
     def add_tables_bulk(self, parent_schema_id: str, names: List[str], db_target_id: Optional[str]) -> List[Dict[str, Any]]:
-        now = int(time.time() * 1000)
+        now = _now_ms()
+        seq = self._table_seq
         out: List[Dict[str, Any]] = []
-        with self._mtx:
+        with self._write_mtx:
+            tables = dict(self._state["tables_by_id"])
             for n in names:
-                tbl = {
-                    "id": f"tbl_{now}_{len(self._tables)+1}",
-                    "name": n,
-                    "schemaId": parent_schema_id,
-                    "dbTargetId": db_target_id,
-                    "status": "not_migrated",
-                    "lastMigratedAt": None,
-                    "mappingHealth": None,
-                    "deviceId": None,
-                }
-                self._tables.append(tbl)
+                tbl = TableRec(
+                    id=f"tbl_{now}_{next(seq)}",
+                    name=n,
+                    schemaId=parent_schema_id,
+                    dbTargetId=db_target_id,
+                )
+                tables[tbl.id] = tbl
                 out.append(tbl)
+            self._publish(tables_by_id=MappingProxyType(tables))
+        with self._appdb_write_lock:
             appdb.add_tables_bulk(out)
         return out
 
     def list_tables(self, *, parent_schema_id: Optional[str] = None, db_target_id: Optional[str] = None, status: Optional[str] = None, name_like: Optional[str] = None) -> List[Dict[str, Any]]:
-        with self._mtx:
-            items = list(self._tables)
+        items = list(self._state["tables_by_id"].values())
         if parent_schema_id:
-            items = [t for t in items if t.get("schemaId") == parent_schema_id]
+            items = [t for t in items if t.schemaId == parent_schema_id]
         if db_target_id:
-            items = [t for t in items if (t.get("dbTargetId") or self._default_db_target_id) == db_target_id]
+            items = [t for t in items if (t.dbTargetId or self._default_db_target_id) == db_target_id]
         if status:
-            items = [t for t in items if t.get("status") == status]
+            items = [t for t in items if t.status == status]
         if name_like:
             s = name_like.lower()
-            items = [t for t in items if s in (t.get("name","" ).lower())]
+            items = [t for t in items if s in t._name_lc]
         return items
 
     def get_table(self, table_id: str) -> Optional[Dict[str, Any]]:
-        with self._mtx:
-            return next((t for t in self._tables if t.get("id") == table_id), None)
+        return self._state["tables_by_id"].get(table_id)
 
     def set_table_status(self, table_id: str, status: str, *, migrated_at_iso: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        with self._mtx:
-            for t in self._tables:
-                if t.get("id") == table_id:
-                    t["status"] = status
-                    if migrated_at_iso is not None:
-                        t["lastMigratedAt"] = migrated_at_iso
-                    appdb.set_table_status(table_id, status, migrated_at_iso)
-                    return t
-        return None
+        with self._write_mtx:
+            tables = self._state["tables_by_id"]
+            t = tables.get(table_id)
+            if t is None:
+                return None
+            t = replace(t, status=status)
+            if migrated_at_iso is not None:
+                t.lastMigratedAt = migrated_at_iso
+            self._publish(tables_by_id=_cow_put(tables, table_id, t))
+        with self._appdb_write_lock:
+            appdb.set_table_status(table_id, status, migrated_at_iso)
+        return t
 
     def delete_table(self, table_id: str) -> bool:
-        with self._mtx:
-            before = len(self._tables)
-            self._tables = [t for t in self._tables if t.get("id") != table_id]
-        appdb.delete_table(table_id)
-        return len(self._tables) < before
+        with self._write_mtx:
+            tables = self._state["tables_by_id"]
+            existed = table_id in tables
+            if existed:
+                self._publish(tables_by_id=_cow_pop(tables, table_id))
+        self._health_cache.pop(table_id, None)
+        with self._appdb_write_lock:
+            appdb.delete_table(table_id)
+        return existed
 
     # -------------- Mappings --------------
     def get_mapping(self, table_id: str) -> Dict[str, Any]:
-        with self._mtx:
-            cur = self._mappings.get(table_id) or {}
-            device_id = cur.get("deviceId")
-            # Fallback: if in-memory mapping lacks binding, use table's persisted deviceId
-            if not device_id:
-                t = self.get_table(table_id)
-                if t and t.get("deviceId"):
-                    device_id = t.get("deviceId")
-                    # Note: don't mutate rows here; just present the binding for callers
-                    try:
-                        # Helpful for diagnostics, but keep it quiet by default
-                        self._log.debug(f"mapping.get: using table fallback deviceId for {table_id}: {device_id}")
-                    except Exception:
-                        pass
-            return {
-                "deviceId": device_id,
-                "rows": dict((cur.get("rows") or {})),
-            }
+        return self._mapping_view(self._state, table_id)
+
+    def _mapping_view(self, st: Mapping[str, Any], table_id: str) -> Dict[str, Any]:
+        cur = st["mappings_by_table"].get(table_id) or {}
+        device_id = cur.get("deviceId")
+        # Fallback: if in-memory mapping lacks binding, use table's persisted deviceId
+        if not device_id:
+            t = st["tables_by_id"].get(table_id)
+            if t and t.deviceId:
+                device_id = t.deviceId
+                # Note: don't mutate rows here; just present the binding for callers
+                try:
+                    # Helpful for diagnostics, but keep it quiet by default
+                    self._log.debug("mapping.get: using table fallback deviceId for %s: %s", table_id, device_id)
+                except Exception:
+                    pass
+        return {
+            "deviceId": device_id,
+            # Shared read-only view; rows are copied only where they are edited
+            "rows": cur.get("rows") or _NO_ROWS,
+        }
+
+    def _bind_table_device(self, st: Mapping[str, Any], table_id: str, device_id: Optional[str]) -> Dict[str, Any]:
+        # Caller must hold _write_mtx; returns the tables_by_id change (if any)
+        # that keeps the table cache in sync for fallback reads
+        tables = st["tables_by_id"]
+        t = tables.get(table_id)
+        if t is None:
+            return {}
+        return {"tables_by_id": _cow_put(tables, table_id, replace(t, deviceId=device_id))}
 
     def upsert_mapping(self, table_id: str, *, device_id: Optional[str] = None, rows_patch: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
-        with self._mtx:
-            cur = self._mappings.get(table_id) or {"deviceId": None, "rows": {}}
-            if device_id is not None:
-                cur["deviceId"] = device_id
+        with self._write_mtx:
+            st = self._state
+            cur = st["mappings_by_table"].get(table_id) or {"deviceId": None, "rows": _NO_ROWS}
+            bound_id = device_id if device_id is not None else cur.get("deviceId")
+            rows = cur.get("rows") or _NO_ROWS
             if rows_patch:
-                cur_rows = cur.get("rows") or {}
+                # One copy of the row index plus one dict per patched field; the
+                # published rows (and their field dicts) are never touched
+                old = rows
+                rows = FrozenRows(old)
                 for k, v in rows_patch.items():
-                    cur_rows[k] = {**(cur_rows.get(k) or {}), **v}
-                cur["rows"] = cur_rows
-            self._mappings[table_id] = cur
-            # Persist device binding in App Local DB for restart
-            appdb.set_table_device_binding(table_id, cur.get("deviceId"))
-            # Update health snapshot in App Local DB
-            health = self.mapping_health(table_id, required_fields=list((rows_patch or {}).keys()))
-            appdb.update_mapping_health(table_id, health)
-            # Keep table cache in sync for fallback reads
-            try:
-                for t in self._tables:
-                    if t.get("id") == table_id:
-                        t["deviceId"] = cur.get("deviceId")
-                        break
-            except Exception:
-                pass
-            try:
-                self._log.info(f"mapping.upsert: table={table_id} deviceId={cur.get('deviceId')} rows={len((rows_patch or {}))}")
-            except Exception:
-                pass
-            return {"deviceId": cur.get("deviceId"), "rows": dict(cur.get("rows") or {})}
+                    prev = old.get(k)
+                    row = {**prev, **v} if prev else dict(v)
+                    if v.get("protocol"):
+                        row["protocol"] = _intern_lc(v["protocol"])
+                    dict.__setitem__(rows, k, row)
+            self._publish(
+                mappings_by_table=_cow_put(st["mappings_by_table"], table_id, {"deviceId": bound_id, "rows": rows}),
+                **self._bind_table_device(st, table_id, bound_id),
+            )
+        out = {"deviceId": bound_id, "rows": rows}
+        health = self.mapping_health(table_id, required_fields=list((rows_patch or {}).keys()))
+        # Persist device binding and health snapshot in App Local DB for restart
+        with self._appdb_write_lock:
+            appdb.upsert_mappings_bulk([(table_id, bound_id, health)])
+        try:
+            self._log.info("mapping.upsert: table=%s deviceId=%s rows=%d", table_id, bound_id, len(rows_patch) if rows_patch else 0)
+        except Exception:
+            pass
+        return out
 
     def replace_mapping(self, table_id: str, mapping: Dict[str, Any]) -> Dict[str, Any]:
-        with self._mtx:
-            device_id = mapping.get("deviceId")
-            rows = mapping.get("rows") or {}
-            self._mappings[table_id] = {"deviceId": device_id, "rows": rows}
-            appdb.set_table_device_binding(table_id, device_id)
-            health = self.mapping_health(table_id, required_fields=list(rows.keys()))
-            appdb.update_mapping_health(table_id, health)
-            # Keep table cache in sync for fallback reads
-            try:
-                for t in self._tables:
-                    if t.get("id") == table_id:
-                        t["deviceId"] = device_id
-                        break
-            except Exception:
-                pass
-            try:
-                self._log.info(f"mapping.replace: table={table_id} deviceId={device_id} rows={len(rows)}")
-            except Exception:
-                pass
-            return self.get_mapping(table_id)
-
-    def mapping_health(self, table_id: str, *, required_fields: List[str]) -> str:
-        m = self.get_mapping(table_id)
-        rows = m.get("rows") or {}
-        if not rows:
-            return "Unmapped"
-        # If no schema is defined (no required fields), treat any mapping as Mapped
-        if not required_fields:
-            return "Mapped"
-        ok = 0
-        for f in required_fields:
-            r = rows.get(f) or {}
-            p = (r.get("protocol") or "").lower()
-            if p == "opcua":
-                if r.get("address") or r.get("nodeId"):
-                    ok += 1
-            elif p == "modbus":
-                if r.get("address") and r.get("dataType"):
-                    ok += 1
-            else:
-                # unknown protocol, do not count
-                pass
-        if ok == 0:
-            return "Unmapped"
-        if ok == len(required_fields):
-            return "Mapped"
-        return "Partially Mapped"
+        device_id = mapping.get("deviceId")
+        rows = mapping.get("rows") or {}
+        with self._write_mtx:
+            st = self._state
+            self._publish(
+                mappings_by_table=_cow_put(st["mappings_by_table"], table_id, {"deviceId": device_id, "rows": _norm_rows(rows)}),
+                **self._bind_table_device(st, table_id, device_id),
+            )
+        health = self.mapping_health(table_id, required_fields=list(rows.keys()))
+        with self._appdb_write_lock:
+            appdb.upsert_mappings_bulk([(table_id, device_id, health)])
+        try:
+            self._log.info("mapping.replace: table=%s deviceId=%s rows=%d", table_id, device_id, len(rows))
+        except Exception:
+            pass
+        return self.get_mapping(table_id)
+
+    def mapping_health(self, table_id: str, *, required_fields: Optional[List[str]] = None) -> str:
+        """Health of a table's mapping against required_fields (default: its schema's fields)."""
+        st = self._state
+        entry = st["mappings_by_table"].get(table_id)
+        if required_fields is None:
+            t = st["tables_by_id"].get(table_id)
+            schema = self.get_schema(t.schemaId or "") if t else None
+            required_fields = [f.get("key") for f in schema.fields] if schema else []
+        key = tuple(required_fields)
+        cached = self._health_cache.get(table_id)
+        if cached is not None and cached[0] is entry and cached[1] == key:
+            return cached[2]
+        health = _compute_health((entry or {}).get("rows") or {}, key)
+        self._health_cache[table_id] = (entry, key, health)
+        return health
 
     def delete_mapping_row(self, table_id: str, field_key: str) -> Dict[str, Any]:
-        with self._mtx:
-            cur = self._mappings.get(table_id) or {"deviceId": None, "rows": {}}
-            rows = cur.get("rows") or {}
-            if field_key in rows:
-                rows.pop(field_key, None)
-            cur["rows"] = rows
-            self._mappings[table_id] = cur
-            return self.get_mapping(table_id)
+        with self._write_mtx:
+            mappings = self._state["mappings_by_table"]
+            cur = mappings.get(table_id) or {"deviceId": None, "rows": _NO_ROWS}
+            rows = FrozenRows(cur.get("rows") or _NO_ROWS)
+            dict.pop(rows, field_key, None)
+            self._publish(mappings_by_table=_cow_put(mappings, table_id, {**cur, "rows": rows}))
+            st = self._state
+        return self._mapping_view(st, table_id)
 
     def set_table_device_binding(self, table_id: str, device_id: Optional[str]) -> None:
         """Set device binding for a table in both memory and App DB.
-        Keeps _tables and _mappings consistent.
+        Keeps the table cache and mappings consistent.
         """
-        with self._mtx:
-            # Update table cache
-            try:
-                for t in self._tables:
-                    if t.get("id") == table_id:
-                        t["deviceId"] = device_id
-                        break
-            except Exception:
-                pass
-            # Update mapping cache
-            try:
-                cur = self._mappings.get(table_id) or {"deviceId": None, "rows": {}}
-                cur["deviceId"] = device_id
-                self._mappings[table_id] = cur
-            except Exception:
-                pass
+        with self._write_mtx:
+            st = self._state
+            cur = st["mappings_by_table"].get(table_id) or {"deviceId": None, "rows": _NO_ROWS}
+            self._publish(
+                mappings_by_table=_cow_put(st["mappings_by_table"], table_id, {**cur, "deviceId": device_id}),
+                **self._bind_table_device(st, table_id, device_id),
+            )
         try:
-            appdb.set_table_device_binding(table_id, device_id)
-            self._log.info(f"table.bind: table={table_id} deviceId={device_id}")
+            with self._appdb_write_lock:
+                appdb.set_table_device_binding(table_id, device_id)
+            self._log.info("table.bind: table=%s deviceId=%s", table_id, device_id)
         except Exception:
             pass
 
     def copy_mapping(self, src_table_id: str, dst_table_id: str) -> Dict[str, Any]:
-        with self._mtx:
-            src = self._mappings.get(src_table_id) or {"deviceId": None, "rows": {}}
+        with self._write_mtx:
+            mappings = self._state["mappings_by_table"]
+            src = mappings.get(src_table_id) or {"deviceId": None, "rows": _NO_ROWS}
             # Do not copy device binding by default; copy only rows
-            dst = self._mappings.get(dst_table_id) or {"deviceId": None, "rows": {}}
-            dst_rows = dict(src.get("rows") or {})
-            dst["rows"] = dst_rows
-            self._mappings[dst_table_id] = dst
-            return self.get_mapping(dst_table_id)
+            dst = mappings.get(dst_table_id) or {"deviceId": None, "rows": _NO_ROWS}
+            # Published rows are immutable, so the copy can share them
+            self._publish(mappings_by_table=_cow_put(mappings, dst_table_id, {**dst, "rows": src.get("rows") or _NO_ROWS}))
+            st = self._state
+        return self._mapping_view(st, dst_table_id)
 
     # -------------- Devices --------------
     def add_device(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        name = (payload.get("name") or "").strip() or f"Device-{int(time.time()*1000)}"
-        protocol = (payload.get("protocol") or "").strip() or "modbus"
+        name = (payload.get("name") or "").strip() or f"Device-{_now_ms()}"
+        protocol = _intern_lc(payload.get("protocol") or "") or PROTO_MODBUS
         # params may include secrets like password; store but redact on read
         params = payload.get("params") or {}
-        dev_id = payload.get("id") or f"dev_{int(time.time()*1000)}"
+        dev_id = payload.get("id") or f"dev_{_now_ms()}"
         auto_reconnect = bool(payload.get("autoReconnect", True))
-        item = {
-            "id": dev_id,
-            "name": name,
-            "protocol": protocol,
-            "status": "disconnected",
-            "latencyMs": None,
-            "lastError": None,
-            "params": params,
-            "autoReconnect": auto_reconnect,
-        }
-        with self._mtx:
+        item = DeviceRec(
+            id=dev_id,
+            name=name,
+            protocol=protocol,
+            params=params,
+            autoReconnect=auto_reconnect,
+        )
+        with self._write_mtx:
+            st = self._state
+            devices = st["devices_by_id"]
             # Prevent duplicate by name (case-insensitive)
-            for d in self._devices.values():
-                if (d.get("name") or "").lower() == name.lower():
-                    return self._redact_device(d) or d
-            self._devices[dev_id] = item
+            d = devices.get(st["device_names_lc"].get(name.lower(), ""))
+            if d is not None:
+                return self._redact_device(d) or d
+            self._publish(
+                devices_by_id=_cow_put(devices, dev_id, item),
+                device_names_lc=_reindex(st["device_names_lc"], _lc(devices[dev_id].name) if dev_id in devices else None, name.lower(), dev_id),
+            )
+        with self._appdb_write_lock:
             appdb.upsert_device(item)
+        self._poke_reconnector()
         return self.get_device(dev_id) or item
 
     def list_devices(self) -> List[Dict[str, Any]]:
-        with self._mtx:
-            return [self._redact_device(d) for d in self._devices.values()]
+        return [self._redact_device(d) for d in self._state["devices_by_id"].values()]
 
     def get_device(self, dev_id: str) -> Optional[Dict[str, Any]]:
-        with self._mtx:
-            dev = self._devices.get(dev_id)
-            return self._redact_device(dev) if dev else None
+        dev = self._state["devices_by_id"].get(dev_id)
+        return self._redact_device(dev) if dev else None
 
     def delete_device(self, dev_id: str) -> bool:
-        with self._mtx:
-            ok = self._devices.pop(dev_id, None) is not None
+        with self._write_mtx:
+            st = self._state
+            devices = st["devices_by_id"]
+            ok = dev_id in devices
+            if ok:
+                self._publish(
+                    devices_by_id=_cow_pop(devices, dev_id),
+                    device_names_lc=_reindex(st["device_names_lc"], _lc(devices[dev_id].name), None, dev_id),
+                )
         if ok:
-            appdb.delete_device(dev_id)
+            with self._appdb_write_lock:
+                appdb.delete_device(dev_id)
         return ok
 
     def update_device_metadata(self, dev_id: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        with self._mtx:
-            dev = self._devices.get(dev_id)
-            if not dev:
+        with self._write_mtx:
+            st = self._state
+            devices = st["devices_by_id"]
+            old = devices.get(dev_id)
+            if not old:
                 return None
-            for k in ("name",):
-                if k in patch:
-                    dev[k] = patch[k]
+            dev = replace(old)
+            if "name" in patch:
+                dev.name = patch["name"]
             if "autoReconnect" in patch:
-                dev["autoReconnect"] = bool(patch.get("autoReconnect"))
-        appdb.update_device_metadata(dev_id, name=patch.get("name"), auto_reconnect=patch.get("autoReconnect"))
-        return self._redact_device(self._devices.get(dev_id))
+                dev.autoReconnect = bool(patch.get("autoReconnect"))
+            self._publish(
+                devices_by_id=_cow_put(devices, dev_id, dev),
+                device_names_lc=_reindex(st["device_names_lc"], _lc(old.name), _lc(dev.name), dev_id),
+            )
+        with self._appdb_write_lock:
+            appdb.update_device_metadata(dev_id, name=patch.get("name"), auto_reconnect=patch.get("autoReconnect"))
+        if dev.autoReconnect:
+            self._poke_reconnector()
+        return self._redact_device(dev)
 
     def set_device_status(self, dev_id: str, *, status: str, latency_ms: Optional[int] = None, last_error: Optional[str] = None) -> Optional[Dict[str, Any]]:
-        with self._mtx:
-            dev = self._devices.get(dev_id)
+        status = sys.intern(status)
+        with self._write_mtx:
+            devices = self._state["devices_by_id"]
+            dev = devices.get(dev_id)
             if not dev:
                 return None
-            dev["status"] = status
-            dev["latencyMs"] = latency_ms
-            dev["lastError"] = last_error
-        appdb.update_device_status(dev_id, status=status, latency_ms=latency_ms, last_error=last_error)
-        return self._redact_device(self._devices.get(dev_id))
+            dev = replace(dev, status=status, latencyMs=latency_ms, lastError=last_error)
+            self._publish(devices_by_id=_cow_put(devices, dev_id, dev))
+        # Persisted by the status flusher; memory is authoritative meanwhile
+        self._status_q.put((dev_id, status, latency_ms, last_error))
+        self._status_pending.set()
+        if self._status_flusher is None:
+            self._start_status_flusher()
+        if status is not STATUS_CONNECTED and status is not STATUS_RECONNECTING:
+            # Dropped outside the reconnect loop; let it retry now
+            self._poke_reconnector()
+        return self._redact_device(dev)
 
-    def _redact_device(self, dev: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    def _start_status_flusher(self) -> None:
+        with self._mtx:
+            if self._status_flusher is not None:
+                return
+            th = threading.Thread(target=self._status_flush_loop, name="dev-status-flush", daemon=True)
+            self._status_flusher = th
+        th.start()
+
+    def _status_flush_loop(self) -> None:
+        while True:
+            self._status_pending.wait()
+            # Let a reconnect tick's worth of updates accumulate
+            time.sleep(0.2)
+            self._status_pending.clear()
+            try:
+                self.flush_device_statuses()
+            except Exception:
+                self._log.exception("device status flush failed")
+
+    def flush_device_statuses(self) -> int:
+        """Write queued device status changes to the App DB in one transaction.
+
+        Coalesces by device (last write wins); returns the number of rows written.
+        """
+        with self._status_flush_lock:
+            latest: Dict[str, Tuple[str, Optional[str], Optional[int], Optional[str]]] = {}
+            get = self._status_q.get_nowait
+            while True:
+                try:
+                    item = get()
+                except queue.Empty:
+                    break
+                latest[item[0]] = item
+            if latest:
+                with self._appdb_write_lock:
+                    appdb.update_device_statuses_bulk(list(latest.values()))
+            return len(latest)
+
+    def _redact_device(self, dev: Optional[DeviceRec]) -> Optional[Dict[str, Any]]:
         if not dev:
             return None
-        params = dict(dev.get("params") or {})
+        params = dict(dev.params or {})
         if "pass" in params:
             params["pass"] = "***"
         if "password" in params:
             params["password"] = "***"
-        d = dict(dev)
+        # Plain dict at the API boundary
+        d = dev.to_dict()
         d["params"] = params
         return d
 
     # -------------- Gateways --------------
     def list_gateways(self) -> List[Dict[str, Any]]:
-        with self._mtx:
-            return list(self._gateways)
+        return list(self._state["gateways_by_id"].values())
 
     def add_gateway(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         name = (payload.get("name") or "").strip()
@@ -478,195 +793,230 @@ class Store:
         if not name or not host:
             raise ValueError("NAME_AND_HOST_REQUIRED")
         # basic validation of ports
-        try:
-            ports = sorted({int(p) for p in ports if int(p) > 0 and int(p) <= 65535})
-        except Exception:
-            raise ValueError("INVALID_PORTS")
-        with self._mtx:
-            for g in self._gateways:
-                if (g.get("name") or "").lower() == name.lower() or (g.get("host") or "").lower() == host.lower():
-                    return g
-            gid = payload.get("id") or f"gw_{int(time.time()*1000)}"
-            gw = {
-                "id": gid,
-                "name": name,
-                "host": host,
-                "adapterId": adapter_id,
-                "nic_hint": nic_hint,
-                "ports": list(ports),
-                "protocol_hint": protocol_hint,
-                "tags": list(tags),
-                "status": "unknown",
-                "last_ping": None,
-                "last_tcp": None,
-            }
-            self._gateways.append(gw)
+        ports = _clean_ports(ports)
+        gid = payload.get("id") or f"gw_{_now_ms()}"
+        gw = GatewayRec(
+            id=gid,
+            name=name,
+            host=host,
+            adapterId=adapter_id,
+            nic_hint=nic_hint,
+            ports=ports,
+            protocol_hint=protocol_hint,
+            tags=list(tags),
+        )
+        with self._write_mtx:
+            st = self._state
+            gateways = st["gateways_by_id"]
+            existing = gateways.get(st["gateway_names_lc"].get(name.lower()) or st["gateway_hosts_lc"].get(host.lower()) or "")
+            if existing is not None:
+                return existing
+            self._publish(gateways_by_id=_cow_put(gateways, gid, gw), **self._gateway_index_changes(gateways.get(gid), gw))
+        with self._appdb_write_lock:
             appdb.upsert_gateway(gw)
-            return gw
+        return gw
+
+    def _gateway_index_changes(self, old: Optional[GatewayRec], new: Optional[GatewayRec]) -> Dict[str, Any]:
+        # Caller must hold _write_mtx
+        st = self._state
+        rid = (new or old).id
+        return {
+            "gateway_names_lc": _reindex(st["gateway_names_lc"], _lc(old.name) if old else None, _lc(new.name) if new else None, rid),
+            "gateway_hosts_lc": _reindex(st["gateway_hosts_lc"], _lc(old.host) if old else None, _lc(new.host) if new else None, rid),
+        }
+
+    def _replace_gateway(self, gid: str, build) -> Optional[Dict[str, Any]]:
+        # Caller must hold _write_mtx; build(old) returns the replacement record
+        gateways = self._state["gateways_by_id"]
+        g = gateways.get(gid)
+        if g is None:
+            return None
+        new = build(g)
+        self._publish(gateways_by_id=_cow_put(gateways, gid, new), **self._gateway_index_changes(g, new))
+        return new
 
     def update_gateway(self, gid: str, patch: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        with self._mtx:
-            gw = next((g for g in self._gateways if g.get("id") == gid), None)
-            if not gw:
+        # Validate and build the field changes before taking the lock
+        changes = {k: patch[k] for k in ("name", "host", "nic_hint", "adapterId", "protocol_hint") if k in patch}
+        if isinstance(patch.get("ports"), list):
+            changes["ports"] = _clean_ports(patch["ports"])
+        if isinstance(patch.get("tags"), list):
+            changes["tags"] = list(patch["tags"])
+
+        def _apply(g: GatewayRec) -> GatewayRec:
+            return replace(g, **changes)
+
+        with self._write_mtx:
+            if self._replace_gateway(gid, _apply) is None:
                 return None
-            # Apply allowed fields
-            for k in ("name", "host", "nic_hint", "adapterId", "protocol_hint"):
-                if k in patch:
-                    gw[k] = patch[k]
-            if "ports" in patch and isinstance(patch.get("ports"), list):
-                try:
-                    ports = sorted({int(p) for p in patch.get("ports") if int(p) > 0 and int(p) <= 65535})
-                except Exception:
-                    raise ValueError("INVALID_PORTS")
-                gw["ports"] = list(ports)
-            if "tags" in patch and isinstance(patch.get("tags"), list):
-                gw["tags"] = list(patch.get("tags") or [])
         # Persist
-        saved = appdb.update_gateway(gid, patch)
+        with self._appdb_write_lock:
+            saved = appdb.update_gateway(gid, {**patch, **changes})
         # Sync from DB canonical copy if available
         if saved is not None:
-            with self._mtx:
-                for i, g in enumerate(self._gateways):
-                    if g.get("id") == gid:
-                        # maintain adapterId for UI compatibility
-                        self._gateways[i] = {
-                            **g,
-                            **saved,
-                            "adapterId": saved.get("adapter_id") or g.get("adapterId"),
-                        }
-                        break
+            with self._write_mtx:
+                self._replace_gateway(gid, lambda g: GatewayRec.from_mapping({
+                    **g,
+                    **saved,
+                    # maintain adapterId for UI compatibility
+                    "adapterId": saved.get("adapter_id") or g.adapterId,
+                }))
         return self.get_gateway(gid)
 
     def get_gateway(self, gid: str) -> Optional[Dict[str, Any]]:
-        with self._mtx:
-            return next((g for g in self._gateways if g.get("id") == gid), None)
+        return self._state["gateways_by_id"].get(gid)
 
     def delete_gateway(self, gid: str) -> bool:
-        with self._mtx:
+        with self._write_mtx:
+            st = self._state
             # Block deletion if referenced by any saved device (Option A)
-            for d in self._devices.values():
-                params = d.get("params") or {}
-                if params.get("gatewayId") == gid:
+            for d in st["devices_by_id"].values():
+                if (d.params or {}).get("gatewayId") == gid:
                     return False
-            before = len(self._gateways)
-            self._gateways = [g for g in self._gateways if g.get("id") != gid]
-        appdb.delete_gateway(gid)
-        return len(self._gateways) < before
+            old = st["gateways_by_id"].get(gid)
+            removed = old is not None
+            if removed:
+                self._publish(gateways_by_id=_cow_pop(st["gateways_by_id"], gid), **self._gateway_index_changes(old, None))
+        with self._appdb_write_lock:
+            appdb.delete_gateway(gid)
+        return removed
 
-    def set_gateway_health(self, gid: str, *, last_ping: Optional[Dict[str, Any]] = None, last_tcp: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    def set_gateway_health(self, gid: str, *, last_ping: Optional[Dict[str, Any]] = None, last_tcp: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Record ping/TCP results; last_tcp is {"open_ports", "scanned_ports", "ts"}."""
         # Determine status
         status: Optional[str] = None
         if last_ping is not None or last_tcp is not None:
             ok_ping = bool((last_ping or {}).get("ok")) if isinstance(last_ping, dict) else None
-            any_open = False
-            if isinstance(last_tcp, list):
-                any_open = any(bool(r.get("status") == "open" or r.get("open")) for r in last_tcp if isinstance(r, dict))
+            any_open = bool(last_tcp.get("open_ports")) if isinstance(last_tcp, dict) else False
             if ok_ping or any_open:
                 status = "reachable"
                 if (ok_ping is False) and any_open:
                     status = "limited"
             else:
                 status = "unreachable"
-        saved = appdb.set_gateway_health(gid, status=status, last_ping=last_ping, last_tcp=last_tcp)
+        with self._appdb_write_lock:
+            saved = appdb.set_gateway_health(gid, status=status, last_ping=last_ping, last_tcp=last_tcp)
         if not saved:
             return None
-        with self._mtx:
-            for i, g in enumerate(self._gateways):
-                if g.get("id") == gid:
-                    # Merge minimal updates
-                    self._gateways[i] = {
-                        **g,
-                        "status": saved.get("status") or status or g.get("status") or "unknown",
-                        "last_ping": saved.get("last_ping") if saved.get("last_ping") is not None else last_ping,
-                        "last_tcp": saved.get("last_tcp") if saved.get("last_tcp") is not None else last_tcp,
-                    }
-                    return self._gateways[i]
-        return None
+        with self._write_mtx:
+            # Merge minimal updates
+            return self._replace_gateway(gid, lambda g: replace(
+                g,
+                status=saved.get("status") or status or g.status or "unknown",
+                last_ping=saved.get("last_ping") if saved.get("last_ping") is not None else last_ping,
+                last_tcp=saved.get("last_tcp") if saved.get("last_tcp") is not None else last_tcp,
+            ))
 
     # -------------- Init/load --------------
     def load_from_app_db(self) -> None:
+        appdb.init()
+        # Read everything from App Local DB before publishing
+        schemas = appdb.load_schemas()
+        tgs, default_id = appdb.load_targets()
+        raw = appdb.load_device_tables()
+        tables = [
+            TableRec(
+                id=r["id"],
+                name=r["name"],
+                schemaId=r["schema_id"],
+                dbTargetId=r["db_target_id"],
+                status=r["status"],
+                lastMigratedAt=r["last_migrated_at"],
+                mappingHealth=r.get("mapping_health"),
+                deviceId=r.get("device_id"),
+            )
+            for r in raw
+        ]
+        gateways = []
+        for g in appdb.load_gateways():
+            gateways.append(
+                GatewayRec(
+                    id=g.get("id"),
+                    name=g.get("name"),
+                    host=g.get("host"),
+                    adapterId=g.get("adapter_id"),
+                    nic_hint=g.get("nic_hint"),
+                    ports=g.get("ports") or [],
+                    protocol_hint=g.get("protocol_hint"),
+                    tags=g.get("tags") or [],
+                    status=g.get("status") or "unknown",
+                    last_ping=g.get("last_ping"),
+                    last_tcp=g.get("last_tcp"),
+                )
+            )
+        devs = [DeviceRec.from_mapping(d) for d in appdb.load_devices()]
+        for d in devs:
+            d.protocol = _intern_lc(d.protocol or "") or PROTO_MODBUS
+        try:
+            jobs = [JobRec.from_mapping(j) for j in appdb.load_jobs()]
+        except Exception:
+            jobs = []
         with self._mtx:
-            appdb.init()
-            # Schemas
-            self._schemas = appdb.load_schemas()
             # Targets + default
-            tgs, default_id = appdb.load_targets()
             self._db_targets = {t["id"]: t for t in tgs}
+            self._db_target_key_index = {}
+            for t in tgs:
+                self._db_target_key_index.setdefault((_lc(t.get("provider")), _lc(t.get("conn"))), t["id"])
             self._default_db_target_id = default_id
-            # Device tables
-            raw = appdb.load_device_tables()
-            self._tables = [
-                {
-                    "id": r["id"],
-                    "name": r["name"],
-                    "schemaId": r["schema_id"],
-                    "dbTargetId": r["db_target_id"],
-                    "status": r["status"],
-                    "lastMigratedAt": r["last_migrated_at"],
-                    "mappingHealth": r.get("mapping_health"),
-                    "deviceId": r.get("device_id"),
-                }
-                for r in raw
-            ]
+            # Jobs
+            self._jobs_by_id = {j.id: j for j in jobs}
+            self._bump()
+        with self._write_mtx:
             # Provide mapping fallbacks on startup for any tables with a saved deviceId
-            try:
-                bound = 0
-                for t in self._tables:
-                    did = t.get("deviceId")
-                    if did:
-                        self._mappings.setdefault(t.get("id"), {"deviceId": did, "rows": {}})
-                        bound += 1
-                # Best-effort: hydrate mapping rows from User DB so mapping status is correct immediately
-                hydrated = 0
+            mappings = dict(self._state["mappings_by_table"])
+            bound = 0
+            for t in tables:
+                did = t.deviceId
+                if did:
+                    mappings.setdefault(t.id, {"deviceId": did, "rows": _NO_ROWS})
+                    bound += 1
+            self._publish(
+                schemas_by_id=MappingProxyType({s["id"]: SchemaRec.from_mapping(s) for s in schemas}),
+                tables_by_id=MappingProxyType({t.id: t for t in tables}),
+                mappings_by_table=MappingProxyType(mappings),
+                devices_by_id=MappingProxyType({d.id: d for d in devs}),
+                gateways_by_id=MappingProxyType({g.id: g for g in gateways}),
+                device_names_lc=_lc_index((_lc(d.name), d.id) for d in devs),
+                gateway_names_lc=_lc_index((_lc(g.name), g.id) for g in gateways),
+                gateway_hosts_lc=_lc_index((_lc(g.host), g.id) for g in gateways),
+            )
+        # Best-effort: hydrate mapping rows from User DB so mapping status is correct immediately.
+        # Runs unlocked: the loader reads targets and mappings back through the Store.
+        try:
+            loaded_by_table: Dict[str, Dict[str, Any]] = {}
+            _mp = _mappings_router()
+            if _mp is not None and tables:
+                # One User DB round-trip per distinct target instead of per table
+                by_target: Dict[Optional[str], List[Dict[str, Any]]] = {}
+                for t in tables:
+                    by_target.setdefault(t.dbTargetId or default_id, []).append(t)
+                for target_id, group in by_target.items():
+                    try:
+                        loaded_by_table.update(_mp._load_mappings_bulk(target_id, group))
+                    except Exception:
+                        pass
+            if loaded_by_table:
+                # Publish all hydrated mappings in one snapshot swap
+                with self._write_mtx:
+                    mappings = dict(self._state["mappings_by_table"])
+                    for tid, loaded in loaded_by_table.items():
+                        mappings[tid] = {
+                            "deviceId": loaded.get("deviceId") or (mappings.get(tid) or {}).get("deviceId"),
+                            "rows": _norm_rows(loaded.get("rows") or {}),
+                        }
+                    self._publish(mappings_by_table=MappingProxyType(mappings))
+                # Refresh bindings + health snapshots in App Local DB with a single commit
                 try:
-                    # Local import to avoid hard dependency if FastAPI deps are missing while scripting
-                    from .routers import mappings as _mp  # type: ignore
-                    for t in self._tables:
-                        try:
-                            loaded = _mp._load_mapping_from_user_db({
-                                "id": t.get("id"),
-                                "name": t.get("name"),
-                                "dbTargetId": t.get("dbTargetId"),
-                            })
-                        except Exception:
-                            loaded = None
-                        if loaded and (loaded.get("rows") or {}):
-                            self._mappings[t.get("id")] = {
-                                "deviceId": loaded.get("deviceId") or self._mappings.get(t.get("id"),{}).get("deviceId"),
-                                "rows": loaded.get("rows") or {},
-                            }
-                            hydrated += 1
+                    updates = []
+                    for tid in loaded_by_table:
+                        updates.append((tid, self.get_mapping(tid).get("deviceId"), self.mapping_health(tid)))
+                    with self.batch():
+                        appdb.upsert_mappings_bulk(updates)
                 except Exception:
                     pass
-                self._log.info(f"store.load: tables={len(self._tables)} device_bound={bound} mappings_hydrated={hydrated}")
-            except Exception:
-                pass
-            # Gateways
-            self._gateways = []
-            for g in appdb.load_gateways():
-                self._gateways.append(
-                    {
-                        "id": g.get("id"),
-                        "name": g.get("name"),
-                        "host": g.get("host"),
-                        "adapterId": g.get("adapter_id"),
-                        "nic_hint": g.get("nic_hint"),
-                        "ports": g.get("ports") or [],
-                        "protocol_hint": g.get("protocol_hint"),
-                        "tags": g.get("tags") or [],
-                        "status": g.get("status") or "unknown",
-                        "last_ping": g.get("last_ping"),
-                        "last_tcp": g.get("last_tcp"),
-                    }
-                )
-            # Devices
-            devs = appdb.load_devices()
-            self._devices = {d["id"]: d for d in devs}
-            # Jobs
-            try:
-                self._jobs = appdb.load_jobs()
-            except Exception:
-                self._jobs = []
+            self._log.info("store.load: tables=%d device_bound=%d mappings_hydrated=%d", len(tables), bound, len(loaded_by_table))
+        except Exception:
+            pass
 
     # -------------- Device reconnect loop --------------
     def start_device_reconnector(self) -> None:
@@ -674,86 +1024,127 @@ class Store:
             if self._dev_thread_started:
                 return
             self._dev_thread_started = True
-        th = threading.Thread(target=self._reconnect_loop, name="dev-reconnect", daemon=True)
+        # Each loop gets its own stop event and executor: a loop from before a
+        # quick stop/start still sees its stop set and exits instead of running
+        # on against the shut-down executor
+        stop = self._dev_stop = threading.Event()
+        # Connect attempts block on sockets; run them side by side so a cycle
+        # costs the slowest timeout rather than the sum of all of them
+        ex = self._reconnect_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="dev-recon")
+        th = threading.Thread(target=self._reconnect_loop, args=(stop, ex), name="dev-reconnect", daemon=True)
         self._dev_thread = th
         try:
             th.start()
         except Exception:
             pass
 
-    def _reconnect_loop(self) -> None:
-        import random
-        while True:
-            # Snapshot to avoid holding lock too long
-            with self._mtx:
-                devices = list(self._devices.values())
-            now = time.perf_counter()
-            for d in devices:
+    def stop_device_reconnector(self) -> None:
+        self._dev_stop.set()
+        self._reconnect_event.set()
+        ex = self._reconnect_executor
+        if ex is not None:
+            ex.shutdown(wait=False)
+        with self._mtx:
+            self._dev_thread_started = False
+        self.flush_device_statuses()
+
+    def _poke_reconnector(self) -> None:
+        self._reconnect_event.set()
+
+    def _reconnect_loop(self, stop: threading.Event, ex: ThreadPoolExecutor) -> None:
+        wake = self._reconnect_event
+        while not stop.is_set():
+            # Clear before scanning so a poke that lands mid-scan is not lost
+            wake.clear()
+            now = time.monotonic()
+            next_due = None
+            # Lock-free snapshot of the published device map
+            for d in self._state["devices_by_id"].values():
                 try:
-                    if not d.get("autoReconnect", True):
+                    if not d.autoReconnect:
                         continue
-                    status = d.get("status") or "disconnected"
-                    if status == "connected":
+                    if d.status == STATUS_CONNECTED:
                         # Optionally, could verify health here
                         continue
-                    bid = self._dev_backoff.get(d["id"]) or {"delay": 1.0, "next": 0.0}
-                    if now < bid.get("next", 0.0):
+                    dev_id = d.id
+                    if dev_id in self._dev_inflight:
                         continue
-                    # Mark reconnecting
-                    self.set_device_status(d["id"], status="reconnecting", latency_ms=None)
-                    ok, lat, err = self._attempt_connect(d)
-                    if ok:
-                        # Connected; reset backoff
-                        self._dev_backoff[d["id"]] = {"delay": 1.0, "next": now + 5.0}
-                        self.set_device_status(d["id"], status="connected", latency_ms=lat, last_error=None)
-                    else:
-                        # Failure; increase backoff
-                        delay = max(1.0, min(30.0, (bid.get("delay", 1.0) * 1.7)))
-                        jitter = random.uniform(0.0, 0.3 * delay)
-                        nxt = now + delay + jitter
-                        self._dev_backoff[d["id"]] = {"delay": delay, "next": nxt}
-                        self.set_device_status(d["id"], status="reconnecting", latency_ms=None, last_error=err or "CONNECT_FAILED")
+                    bo = self._dev_backoff.get(dev_id)
+                    if bo is not None and now < bo[1]:
+                        if next_due is None or bo[1] < next_due:
+                            next_due = bo[1]
+                        continue
+                    self._dev_inflight.add(dev_id)
+                    try:
+                        ex.submit(self._try_reconnect, dev_id)
+                    except BaseException:
+                        # Not scheduled: release the device so a later scan retries it
+                        self._dev_inflight.discard(dev_id)
+                        raise
+                except RuntimeError:
+                    # Executor shut down (reconnector stopped)
+                    return
                 except Exception:
                     pass
-            time.sleep(1.0)
+            # Sleep until the earliest backoff expires; status changes, new
+            # devices and finished attempts poke the event instead
+            wake.wait(None if next_due is None else max(0.0, next_due - time.monotonic()))
+
+    def _try_reconnect(self, dev_id: str) -> None:
+        try:
+            d = self._state["devices_by_id"].get(dev_id)
+            if not d:
+                return
+            # Mark reconnecting
+            self.set_device_status(dev_id, status=STATUS_RECONNECTING, latency_ms=None)
+            ok, lat, err = self._attempt_connect(d)
+            now = time.monotonic()
+            if ok:
+                # Connected; reset backoff
+                self._dev_backoff[dev_id] = (0, now + 5.0)
+                self.set_device_status(dev_id, status=STATUS_CONNECTED, latency_ms=lat, last_error=None)
+            else:
+                # Failure; step up the ladder, plus up to 30% jitter
+                attempt = min(self._dev_backoff.get(dev_id, (0, 0.0))[0] + 1, _BACKOFF_MAX)
+                delay = _BACKOFF_LADDER[attempt]
+                self._dev_backoff[dev_id] = (attempt, now + delay + random.random() * 0.3 * delay)
+                self.set_device_status(dev_id, status=STATUS_RECONNECTING, latency_ms=None, last_error=err or "CONNECT_FAILED")
+        except Exception:
+            pass
+        finally:
+            self._dev_inflight.discard(dev_id)
+            self._poke_reconnector()
 
     def _attempt_connect(self, dev: Dict[str, Any]) -> (bool, int, Optional[str]):
-        proto = (dev.get("protocol") or "").lower()
+        proto = dev.get("protocol")
         params = dev.get("params") or {}
         t0 = time.perf_counter()
         try:
-            if proto == "modbus":
+            if proto is PROTO_MODBUS:
                 host = (params.get("host") or params.get("ip") or "").strip()
                 port = int(params.get("port", 502))
                 if not host:
                     return False, 0, "HOST_REQUIRED"
+                timeout = float(params.get("timeoutMs", 2000)) / 1000.0
+                # Reachability only: a TCP connect is all ModbusTcpClient.connect() does
+                t0 = time.perf_counter()
                 try:
-                    from pymodbus.client import ModbusTcpClient  # type: ignore
-                except Exception:
-                    return False, 0, "PYMODBUS_MISSING"
-                client = ModbusTcpClient(host=host, port=port)
-                ok = False
-                try:
-                    ok = client.connect()
-                finally:
-                    try:
-                        client.close()
-                    except Exception:
+                    with socket.create_connection((host, port), timeout=timeout):
                         pass
-                dt = int((time.perf_counter() - t0) * 1000)
-                return (True, dt, None) if ok else (False, dt, "TCP_CONNECT_FAILED")
-            elif proto == "opcua":
+                except OSError:
+                    return False, int((time.perf_counter() - t0) * 1000), "TCP_CONNECT_FAILED"
+                return True, int((time.perf_counter() - t0) * 1000), None
+            elif proto is PROTO_OPCUA:
                 ep = (params.get("endpoint") or "").strip()
                 if "0.0.0.0" in ep:
                     ep = ep.replace("0.0.0.0", "127.0.0.1")
                 if not ep:
                     return False, 0, "ENDPOINT_REQUIRED"
-                try:
-                    from opcua import Client  # type: ignore
-                except Exception:
+                if _OPCUA_CLIENT is None:
                     return False, 0, "OPCUA_PKG_MISSING"
-                client = Client(ep)
+                client = _OPCUA_CLIENT(ep)
                 try:
+                    t0 = time.perf_counter()
                     client.connect(); client.disconnect()
                 except Exception as e:
                     dt = int((time.perf_counter() - t0) * 1000)
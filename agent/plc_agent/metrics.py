@@ -1,59 +1,271 @@
 from __future__ import annotations
 
+import datetime as _dt
+import sys
 import threading
 import time
-from collections import deque
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from itertools import islice
 from dataclasses import dataclass, field
 from typing import Deque, Dict, List, Optional, Tuple, Any
 
 
+# Internal timestamps are time.monotonic() so a wall-clock step cannot reorder or
+# merge seconds; add this offset (captured once) when emitting epoch seconds
+_WALL_EPOCH = time.time() - time.monotonic()
+
+
+def wall_ts(mono: float) -> int:
+    """Epoch seconds for a monotonic timestamp recorded by this module."""
+    return int(mono + _WALL_EPOCH)
+
+
+_IST = _dt.timezone(_dt.timedelta(hours=5, minutes=30))
+
+
 def _utc_now_iso() -> str:
     # Return IST (UTC+05:30) ISO string for UI/reporting consistency
-    import datetime as _dt
-    ist = _dt.timezone(_dt.timedelta(hours=5, minutes=30))
-    return _dt.datetime.now(ist).replace(microsecond=0).isoformat()
+    return _dt.datetime.now(_IST).replace(microsecond=0).isoformat()
 
 
-@dataclass
-class _SecSample:
-    ts: float
-    reads: int = 0
-    read_err: int = 0
-    writes: int = 0
-    write_err: int = 0
-    triggers: int = 0
-    fires: int = 0
-    suppressed: int = 0
+class P2Quantile:
+    """Streaming quantile estimate (Jain & Chlamtac P-square algorithm).
+
+    Five markers, O(1) per sample, no stored samples.
+    """
+
+    __slots__ = ("p", "n", "q", "pos", "des", "inc")
+
+    def __init__(self, p: float) -> None:
+        self.p = p
+        self.n = 0
+        self.q: List[float] = []
+        self.pos = [1, 2, 3, 4, 5]
+        self.des = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self.inc = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        q = self.q
+        if self.n < 5:
+            q.append(x)
+            self.n += 1
+            if self.n == 5:
+                q.sort()
+            return
+        self.n += 1
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        pos = self.pos
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        des = self.des
+        inc = self.inc
+        for i in range(5):
+            des[i] += inc[i]
+        for i in (1, 2, 3):
+            d = des[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                d = 1 if d > 0 else -1
+                # Parabolic adjustment, falling back to linear if it overshoots a neighbour
+                qn = q[i] + d / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + d) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i])
+                    + (pos[i + 1] - pos[i] - d) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if not (q[i - 1] < qn < q[i + 1]):
+                    qn = q[i] + d * (q[i + d] - q[i]) / (pos[i + d] - pos[i])
+                q[i] = qn
+                pos[i] += d
+
+    def value(self) -> Optional[float]:
+        if self.n == 0:
+            return None
+        if self.n < 5:
+            arr = sorted(self.q)
+            return float(arr[max(0, min(len(arr) - 1, int(self.p * (len(arr) - 1))))])
+        return float(self.q[2])
+
+
+class _RecentQuantiles:
+    """P50/P95 over roughly the last `span` samples.
+
+    Estimators restart every `span` samples; until the new generation has a few
+    samples the previous generation's values are reported.
+    """
+
+    __slots__ = ("span", "n", "cur", "prev")
+
+    def __init__(self, span: int = 600) -> None:
+        self.span = span
+        self.n = 0
+        self.cur = (P2Quantile(0.50), P2Quantile(0.95))
+        self.prev: Optional[Tuple[Optional[float], Optional[float]]] = None
+
+    def add(self, x: float) -> None:
+        if self.n >= self.span:
+            self.prev = self.values()
+            self.cur = (P2Quantile(0.50), P2Quantile(0.95))
+            self.n = 0
+        self.n += 1
+        p50, p95 = self.cur
+        p50.add(x)
+        p95.add(x)
+
+    def values(self) -> Tuple[Optional[float], Optional[float]]:
+        if self.n < 5 and self.prev is not None:
+            return self.prev
+        p50, p95 = self.cur
+        return p50.value(), p95.value()
+
+
+# Per-second ring size (~5 minutes @ 1s)
+_RING_SECS = 300
+# Counter columns of the per-second ring
+C_READS, C_READ_ERR, C_WRITES, C_WRITE_ERR, C_TRIGGERS, C_FIRES, C_SUPPRESSED = range(7)
+_COLS = range(7)
+_ZERO_COUNTS: Tuple[int, ...] = (0,) * 7
+# Buffered record event kinds
+_EV_READ, _EV_WRITE, _EV_TRIGGER = range(3)
+# Distinct error codes kept per job; the least recently seen code is evicted
+_MAX_ERROR_CODES = 64
+
+
+def _int_ring(fill: int = 0) -> array:
+    return array("q", [fill]) * _RING_SECS
+
+
+# Latency samples kept per job and direction (float32 ring, 4 bytes per sample)
+_LAT_RING = 1800
+
+
+def _lat_ring() -> array:
+    return array("f", [0.0]) * _LAT_RING
+
+
+def _ring_tail(ring: array, total: int, n: int) -> List[float]:
+    # Last n of `total` samples written round-robin into ring, oldest first
+    n = min(n, total, _LAT_RING)
+    end = total % _LAT_RING
+    if n <= end:
+        return ring[end - n:end].tolist()
+    return ring[_LAT_RING - (n - end):].tolist() + ring[:end].tolist()
 
 
 @dataclass
 class JobMetrics:
     job_id: str
-    # per-second samples window (store ~5 minutes @ 1s)
-    per_sec: Deque[_SecSample] = field(default_factory=lambda: deque(maxlen=300))
-    # rolling latencies (ms)
-    read_lat_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1800))
-    write_lat_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1800))
-    # error map: code -> (count, last_message, last_ts)
-    errors: Dict[str, Tuple[int, str, float]] = field(default_factory=dict)
+    # per-second counters, one int64 column per C_* counter; slot = absolute second % _RING_SECS
+    per_sec: List[array] = field(default_factory=lambda: [_int_ring() for _ in _COLS])
+    # absolute second held by each slot (-1 = idle second, nothing recorded)
+    _slot_sec: array = field(default_factory=lambda: _int_ring(-1))
+    # running counter totals as of the start of each ring second (same layout as
+    # per_sec); window sums are totals(head) - _cum[first second of window]
+    _cum: List[array] = field(default_factory=lambda: [_int_ring() for _ in _COLS])
+    # absolute second of the newest slot, and of the first slot ever written
+    _head: int = -1
+    _first: int = -1
+    # rolling latencies (ms): ring slot = sample count % _LAT_RING
+    _read_lat: array = field(default_factory=_lat_ring)
+    _write_lat: array = field(default_factory=_lat_ring)
+    _read_lat_n: int = 0
+    _write_lat_n: int = 0
+    # streaming P50/P95 of the same latencies, read by summary_last_secs
+    _read_q: _RecentQuantiles = field(default_factory=_RecentQuantiles)
+    _write_q: _RecentQuantiles = field(default_factory=_RecentQuantiles)
+    # (window, second, summary): summary_last_secs result reused within one second
+    _sum_cache: Tuple[int, int, Optional[Dict[str, Any]]] = (-1, -1, None)
+    # error map, most recently seen last: code -> [count, last_message, last_ts]
+    errors: "OrderedDict[str, List[Any]]" = field(default_factory=OrderedDict)
     # mapping of table_id -> target_id for writes (last seen)
     targets: Dict[str, Optional[str]] = field(default_factory=dict)
     # run state
     active_run: Optional[Dict[str, Any]] = None
     mtx: threading.RLock = field(default_factory=threading.RLock)
+    # per-thread event buffers (see _record) and the registry readers drain
+    _tls: threading.local = field(default_factory=threading.local)
+    _bufs: List[Tuple[threading.Thread, List[tuple]]] = field(default_factory=list)
 
-    def _ensure_current_second(self) -> _SecSample:
-        now = time.time()
-        with self.mtx:
-            if self.per_sec and int(self.per_sec[-1].ts) == int(now):
-                return self.per_sec[-1]
-            s = _SecSample(ts=now)
-            self.per_sec.append(s)
-            return s
+    def _ensure_current_second(self, now: float) -> int:
+        # Caller holds mtx; now is time.monotonic(). Returns the ring slot of now's
+        # second, or -1 once that second has left the ring
+        sec = int(now)
+        head = self._head
+        if sec <= head:
+            if sec <= head - _RING_SECS:
+                return -1
+            # A late event (buffered while another thread moved the head on)
+            # still counts in its own second; _carry fixes up the later totals
+            slot = sec % _RING_SECS
+            self._slot_sec[slot] = sec
+            if sec < self._first:
+                self._first = sec
+            return slot
+        ring = self.per_sec
+        cum = self._cum
+        if head < 0:
+            base = _ZERO_COUNTS
+            self._first = sec
+        else:
+            hs = head % _RING_SECS
+            base = tuple(cum[c][hs] + ring[c][hs] for c in _COLS)
+        # The new second and any idle seconds before it start from the same totals
+        slot_sec = self._slot_sec
+        for i in range(max(head + 1, sec - _RING_SECS + 1), sec + 1):
+            slot = i % _RING_SECS
+            for c in _COLS:
+                ring[c][slot] = 0
+                cum[c][slot] = base[c]
+            slot_sec[slot] = -1
+        slot = sec % _RING_SECS
+        slot_sec[slot] = sec
+        self._head = sec
+        return slot
+
+    def _carry(self, sec: int, before: Tuple[int, ...]) -> None:
+        # Caller holds mtx. Counts were added to an earlier second than the head:
+        # add the same deltas to the running totals of every later second
+        slot = sec % _RING_SECS
+        ring = self.per_sec
+        cum = self._cum
+        for c in _COLS:
+            d = ring[c][slot] - before[c]
+            if d:
+                col = cum[c]
+                for i in range(sec + 1, self._head + 1):
+                    col[i % _RING_SECS] += d
+
+    def _window_lo(self, now_sec: int, window: int) -> int:
+        # First second of (now_sec - window, now_sec] still held by the ring
+        return max(now_sec - window + 1, self._head - _RING_SECS + 1, self._first)
+
+    def _window_counts(self, now_sec: int, window: int) -> Tuple[int, ...]:
+        # Caller holds mtx. Counter sums over seconds (now_sec - window, now_sec]
+        head = self._head
+        if head < 0:
+            return _ZERO_COUNTS
+        lo = self._window_lo(now_sec, window)
+        if lo > head:
+            return _ZERO_COUNTS
+        hs = head % _RING_SECS
+        ls = lo % _RING_SECS
+        ring = self.per_sec
+        cum = self._cum
+        return tuple(cum[c][hs] + ring[c][hs] - cum[c][ls] for c in _COLS)
 
     def start_run(self) -> None:
         with self.mtx:
             if self.active_run is None:
+                # Events recorded before the run started do not belong to it
+                self._drain()
                 self.active_run = {
                     "started_at": _utc_now_iso(),
                     "rows": 0,
@@ -62,23 +274,18 @@ class JobMetrics:
                     "write_lat_sum": 0.0,
                     "write_lat_n": 0,
                     "errors": 0,
+                    # monotonic start, for the duration (not part of the returned run)
+                    "_t0": time.monotonic(),
                 }
 
     def end_run(self) -> Optional[Dict[str, Any]]:
         with self.mtx:
             if not self.active_run:
                 return None
+            self._drain()
             run = dict(self.active_run)
             run["stopped_at"] = _utc_now_iso()
-            # compute duration
-            run["duration_ms"] = None
-            try:
-                import datetime as _dt
-                a = _dt.datetime.fromisoformat(run["started_at"].replace("Z", ""))
-                b = _dt.datetime.fromisoformat(run["stopped_at"].replace("Z", ""))
-                run["duration_ms"] = int((b - a).total_seconds() * 1000)
-            except Exception:
-                pass
+            run["duration_ms"] = int((time.monotonic() - run.pop("_t0")) * 1000)
             # compute avgs
             r_n = max(1, int(run.get("read_lat_n") or 0))
             w_n = max(1, int(run.get("write_lat_n") or 0))
@@ -90,77 +297,162 @@ class JobMetrics:
             self.active_run = None
             return run
 
-    def record_read(self, latency_ms: float, *, ok: bool) -> None:
-        s = self._ensure_current_second()
+    def _buffer(self) -> List[tuple]:
+        # This thread's pending events, registered once so readers can drain them
+        tls = self._tls
+        buf = getattr(tls, "buf", None)
+        if buf is None:
+            buf = tls.buf = []
+            tls.sec = -1
+            with self.mtx:
+                self._bufs.append((threading.current_thread(), buf))
+        return buf
+
+    def _record(self, ev: tuple) -> None:
+        # Lock-free fast path: append to this thread's buffer (list.append is
+        # atomic) and apply the backlog under the lock once per second
+        buf = self._buffer()
+        buf.append(ev)
+        tls = self._tls
+        sec = int(ev[1])
+        if sec != tls.sec:
+            tls.sec = sec
+            with self.mtx:
+                self._apply(buf)
+
+    def _apply(self, buf: List[tuple]) -> None:
+        # Caller holds mtx. Applies the events buffered so far; the owning thread
+        # may keep appending, so only the first n entries are taken and removed
+        n = len(buf)
+        if not n:
+            return
+        events = buf[:n]
+        del buf[:n]
+        ring = self.per_sec
+        run = self.active_run
+        for ev in events:
+            kind = ev[0]
+            sec = int(ev[1])
+            slot = self._ensure_current_second(ev[1])
+            # Events older than the ring only feed latencies and the active run
+            late = 0 <= slot and sec < self._head
+            if late:
+                before = tuple(ring[c][slot] for c in _COLS)
+            if kind == _EV_READ:
+                _, _, latency_ms, ok = ev
+                if slot >= 0:
+                    ring[C_READS if ok else C_READ_ERR][slot] += 1
+                self._read_lat[self._read_lat_n % _LAT_RING] = latency_ms
+                self._read_lat_n += 1
+                self._read_q.add(latency_ms)
+                if run is not None:
+                    run["read_lat_sum"] += float(latency_ms)
+                    run["read_lat_n"] += 1
+                    if not ok:
+                        run["errors"] += 1
+            elif kind == _EV_WRITE:
+                _, _, latency_ms, ok, rows, table_id, target_id = ev
+                if slot < 0:
+                    pass
+                elif ok:
+                    ring[C_WRITES][slot] += int(rows)
+                else:
+                    ring[C_WRITE_ERR][slot] += 1
+                self._write_lat[self._write_lat_n % _LAT_RING] = latency_ms
+                self._write_lat_n += 1
+                self._write_q.add(latency_ms)
+                if table_id is not None:
+                    self.targets[table_id] = target_id
+                if run is not None:
+                    run["rows"] += int(rows)
+                    run["write_lat_sum"] += float(latency_ms)
+                    run["write_lat_n"] += 1
+                    if not ok:
+                        run["errors"] += 1
+            elif slot >= 0:
+                _, _, fired, suppressed = ev
+                ring[C_TRIGGERS][slot] += 1
+                if fired:
+                    ring[C_FIRES][slot] += 1
+                if suppressed:
+                    ring[C_SUPPRESSED][slot] += 1
+            if late:
+                self._carry(sec, before)
+
+    def _drain(self) -> None:
+        # Caller holds mtx. Apply every thread's pending events; forget threads that exited
+        live = []
+        for th, buf in self._bufs:
+            # Check before applying: a thread that exits meanwhile may still append
+            if th.is_alive():
+                live.append((th, buf))
+            self._apply(buf)
+        self._bufs = live
+
+    def flush(self) -> None:
+        """Apply events still buffered by recording threads."""
         with self.mtx:
-            if ok:
-                s.reads += 1
-            else:
-                s.read_err += 1
-            self.read_lat_ms.append(latency_ms)
-            if self.active_run is not None:
-                self.active_run["read_lat_sum"] += float(latency_ms)
-                self.active_run["read_lat_n"] += 1
-                if not ok:
-                    self.active_run["errors"] += 1
+            self._drain()
 
-    def record_write(self, latency_ms: float, *, ok: bool, rows: int, table_id: Optional[str], target_id: Optional[str]) -> None:
-        s = self._ensure_current_second()
+    def recent_write_latencies(self, n: int = _LAT_RING) -> List[float]:
+        """Up to the last n write latencies (ms), oldest first."""
         with self.mtx:
-            if ok:
-                s.writes += int(rows)
-            else:
-                s.write_err += 1
-            self.write_lat_ms.append(latency_ms)
-            if table_id is not None:
-                self.targets[table_id] = target_id
-            if self.active_run is not None:
-                self.active_run["rows"] += int(rows)
-                self.active_run["write_lat_sum"] += float(latency_ms)
-                self.active_run["write_lat_n"] += 1
-                if not ok:
-                    self.active_run["errors"] += 1
+            self._drain()
+            return _ring_tail(self._write_lat, self._write_lat_n, n)
+
+    def record_read(self, latency_ms: float, *, ok: bool) -> None:
+        self._record((_EV_READ, time.monotonic(), latency_ms, ok))
+
+    def record_write(self, latency_ms: float, *, ok: bool, rows: int, table_id: Optional[str], target_id: Optional[str]) -> None:
+        self._record((_EV_WRITE, time.monotonic(), latency_ms, ok, rows, table_id, target_id))
 
     def record_trigger_eval(self, fired: bool, suppressed: bool = False) -> None:
-        s = self._ensure_current_second()
-        with self.mtx:
-            s.triggers += 1
-            if fired:
-                s.fires += 1
-            if suppressed:
-                s.suppressed += 1
+        self._record((_EV_TRIGGER, time.monotonic(), fired, suppressed))
 
     def record_error(self, code: str, message: str) -> None:
+        message = str(message)
+        if len(message) > 512:
+            message = message[:512]
+        now = time.monotonic()
         with self.mtx:
-            count, _, _ = self.errors.get(code, (0, "", 0.0))
-            self.errors[code] = (count + 1, str(message)[:512], time.time())
+            errors = self.errors
+            row = errors.get(code)
+            if row is not None:
+                row[0] += 1
+                row[1] = message
+                row[2] = now
+                errors.move_to_end(code)
+            else:
+                errors[sys.intern(code)] = [1, message, now]
+                if len(errors) > _MAX_ERROR_CODES:
+                    errors.popitem(last=False)
+
+    def error_rows(self) -> List[Tuple[str, int, str, float]]:
+        """(code, count, last_message, last_ts) per error code, oldest first."""
+        with self.mtx:
+            return [(code, cnt, msg, ts) for code, (cnt, msg, ts) in self.errors.items()]
 
     def summary_last_secs(self, window: int = 60) -> Dict[str, Any]:
-        now = time.time()
-        reads = read_err = writes = write_err = trg = fire = sup = 0
+        """Counters and latency quantiles over the last `window` seconds.
+
+        Recomputed at most once per wall-clock second per window; the returned
+        dict is shared with other callers in that second, so treat it as read-only.
+        """
+        now = time.monotonic()
+        sec = int(now)
+        cw, cs, cached = self._sum_cache
+        if cs == sec and cw == window:
+            return cached
         with self.mtx:
-            for s in self.per_sec:
-                if now - s.ts <= window:
-                    reads += s.reads
-                    read_err += s.read_err
-                    writes += s.writes
-                    write_err += s.write_err
-                    trg += s.triggers
-                    fire += s.fires
-                    sup += s.suppressed
-            def _q(vals: Deque[float], p: float) -> Optional[float]:
-                arr = [v for v in vals][-min(len(vals), 600):]
-                if not arr:
-                    return None
-                arr.sort()
-                k = max(0, min(len(arr) - 1, int(p * (len(arr) - 1))))
-                return float(arr[k])
-            p50r = _q(self.read_lat_ms, 0.50)
-            p95r = _q(self.read_lat_ms, 0.95)
-            p50w = _q(self.write_lat_ms, 0.50)
-            p95w = _q(self.write_lat_ms, 0.95)
+            cw, cs, cached = self._sum_cache
+            if cs == sec and cw == window:
+                return cached
+            self._drain()
+            reads, read_err, writes, write_err, trg, fire, sup = self._window_counts(int(now), window + 1)
+            p50r, p95r = self._read_q.values()
+            p50w, p95w = self._write_q.values()
         err_pct = (read_err + write_err) / max(1, (reads + writes)) * 100.0
-        return {
+        out = {
             "reads": reads,
             "readErrors": read_err,
             "writes": writes,
@@ -174,23 +466,33 @@ class JobMetrics:
             "writeP95": p95w,
             "errorPct": err_pct,
         }
+        self._sum_cache = (window, sec, out)
+        return out
 
     def timeseries(self, since_secs: int = 900) -> List[Dict[str, Any]]:
-        now = time.time()
+        now = time.monotonic()
         out: List[Dict[str, Any]] = []
         with self.mtx:
-            for s in list(self.per_sec):
-                if now - s.ts <= since_secs:
-                    out.append({
-                        "ts": int(s.ts),
-                        "reads": s.reads,
-                        "readErrors": s.read_err,
-                        "writes": s.writes,
-                        "writeErrors": s.write_err,
-                        "triggers": s.triggers,
-                        "fires": s.fires,
-                        "suppressed": s.suppressed,
-                    })
+            self._drain()
+            head = self._head
+            if head < 0:
+                return out
+            reads, read_err, writes, write_err, trg, fire, sup = self.per_sec
+            slot_sec = self._slot_sec
+            for i in range(self._window_lo(int(now), since_secs + 1), head + 1):
+                j = i % _RING_SECS
+                if slot_sec[j] != i:
+                    continue
+                out.append({
+                    "ts": wall_ts(i),
+                    "reads": reads[j],
+                    "readErrors": read_err[j],
+                    "writes": writes[j],
+                    "writeErrors": write_err[j],
+                    "triggers": trg[j],
+                    "fires": fire[j],
+                    "suppressed": sup[j],
+                })
         return out
 
 
@@ -200,6 +502,8 @@ class SystemMetrics:
         self.running = False
         self.thread: Optional[threading.Thread] = None
         self.per_sec: Deque[Dict[str, Any]] = deque(maxlen=600)  # ~10min
+        # "ts" of each per_sec sample, kept in step with it for bisecting
+        self._ts: Deque[float] = deque(maxlen=600)
         self._last_disk: Optional[Tuple[int, int]] = None
         self._last_net: Optional[Tuple[int, int]] = None
 
@@ -221,10 +525,13 @@ class SystemMetrics:
             import psutil  # type: ignore
         except Exception:
             # Fallback: no psutil, do nothing but keep API alive
+            deadline = time.monotonic()
             while self.running:
                 with self.mtx:
+                    ts = wall_ts(time.monotonic())
+                    self._ts.append(ts)
                     self.per_sec.append({
-                        "ts": int(time.time()),
+                        "ts": ts,
                         "cpu": None,
                         "mem": None,
                         "disk_rps": None,
@@ -235,9 +542,11 @@ class SystemMetrics:
                         "proc_rss_mb": None,
                         "proc_handles": None,
                     })
-                time.sleep(1.0)
+                deadline += 1.0
+                time.sleep(max(0.0, deadline - time.monotonic()))
             return
         proc = psutil.Process()
+        num_handles = getattr(proc, "num_handles", None) or getattr(proc, "num_fds", None)
         # prime counters
         try:
             d0 = psutil.disk_io_counters()
@@ -247,8 +556,16 @@ class SystemMetrics:
         except Exception:
             self._last_disk = None
             self._last_net = None
+        # Tick on a fixed 1s deadline so psutil call time does not accumulate as drift;
+        # rates are divided by the measured interval in case a tick runs late
+        prev = time.monotonic()
+        deadline = prev + 1.0
+        time.sleep(1.0)
         while self.running:
-            ts = int(time.time())
+            now = time.monotonic()
+            dt = max(1e-3, now - prev)
+            prev = now
+            ts = wall_ts(now)
             try:
                 cpu = float(psutil.cpu_percent(interval=None))
                 mem = float(psutil.virtual_memory().percent)
@@ -258,14 +575,16 @@ class SystemMetrics:
                 if self._last_disk is not None:
                     dr = max(0, int(getattr(d, "read_bytes", 0)) - self._last_disk[0])
                     dw = max(0, int(getattr(d, "write_bytes", 0)) - self._last_disk[1])
-                    rps, wps = dr, dw
+                    rps, wps = int(dr / dt), int(dw / dt)
                 self._last_disk = (int(getattr(d, "read_bytes", 0)), int(getattr(d, "write_bytes", 0)))
                 if self._last_net is not None:
                     rx = max(0, int(getattr(n, "bytes_recv", 0)) - self._last_net[0])
                     tx = max(0, int(getattr(n, "bytes_sent", 0)) - self._last_net[1])
-                    rxps, txps = rx, tx
+                    rxps, txps = int(rx / dt), int(tx / dt)
                 self._last_net = (int(getattr(n, "bytes_recv", 0)), int(getattr(n, "bytes_sent", 0)))
-                with self.mtx:
+                # One process snapshot for all three reads (single /proc scrape or
+                # Win32 query); collected before taking the lock snapshot() needs
+                with proc.oneshot():
                     try:
                         rss = float(proc.memory_info().rss) / (1024 * 1024)
                     except Exception:
@@ -275,9 +594,11 @@ class SystemMetrics:
                     except Exception:
                         pcpu = None
                     try:
-                        handles = proc.num_handles() if hasattr(proc, "num_handles") else proc.num_fds() if hasattr(proc, "num_fds") else None
+                        handles = num_handles() if num_handles is not None else None
                     except Exception:
                         handles = None
+                with self.mtx:
+                    self._ts.append(ts)
                     self.per_sec.append({
                         "ts": ts,
                         "cpu": cpu,
@@ -293,12 +614,22 @@ class SystemMetrics:
             except Exception:
                 # keep going
                 pass
-            time.sleep(1.0)
+            deadline += 1.0
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                # Fell more than a tick behind: realign instead of bursting to catch up
+                deadline = time.monotonic()
+                delay = 0.0
+            time.sleep(delay)
 
     def snapshot(self, window_secs: int = 300) -> Dict[str, Any]:
-        now = time.time()
+        # Sample "ts" values are monotonic-derived epoch seconds; compare on the same scale
+        now = time.monotonic() + _WALL_EPOCH
         with self.mtx:
-            arr = [s for s in self.per_sec if now - s.get("ts", 0) <= window_secs]
+            # Samples are appended in ts order: binary-search the window start
+            per_sec = self.per_sec
+            start = bisect_left(self._ts, now - window_secs)
+            arr = list(islice(per_sec, start, None))
         return {
             "items": arr,
             "now": int(now),
@@ -313,6 +644,10 @@ class MetricsRegistry:
         # background rollup thread placeholder (future)
 
     def get_job(self, job_id: str) -> JobMetrics:
+        # Lock-free hit (dict.get is atomic under the GIL); lock only to insert
+        jm = self.jobs.get(job_id)
+        if jm is not None:
+            return jm
         with self.mtx:
             jm = self.jobs.get(job_id)
             if jm is None:
@@ -25,40 +25,38 @@ def _choose_port(preferred: int, host: str = "127.0.0.1") -> int:
 
 def _write_lockfile(port: int, token: str) -> None:
     pid = os.getpid()
-    data = {"pid": pid, "port": port, "token": token}
-    # Prefer ProgramData (service path), then fall back to user LocalAppData
-    wrote_any = False
-    # 1) ProgramData
-    try:
-        base = os.environ.get("ProgramData") or os.getcwd()
-        folder = Path(base) / "PLCLogger" / "agent"
-        folder.mkdir(parents=True, exist_ok=True)
-        path = folder / "agent.lock.json"
-        path.write_text(json.dumps(data))
-        print(f"Lockfile: {path}")
-        wrote_any = True
-    except Exception as e:
-        print("Lockfile write failed (ProgramData):", e, file=sys.stderr)
-    # 2) LocalAppData fallback for dev
-    try:
-        base_local = os.environ.get("LOCALAPPDATA")
-        if base_local:
-            folder = Path(base_local) / "PLCLogger" / "agent"
-            folder.mkdir(parents=True, exist_ok=True)
-            path = folder / "agent.lock.json"
-            path.write_text(json.dumps(data))
-            print(f"Lockfile (LocalAppData): {path}")
-            wrote_any = True
-    except Exception as e:
-        print("Lockfile write failed (LocalAppData):", e, file=sys.stderr)
-    # 3) CWD as a last resort (dev)
-    if not wrote_any:
+    text = json.dumps({"pid": pid, "port": port, "token": token})
+    # Prefer ProgramData (service path), then user LocalAppData, then CWD (dev);
+    # stop at the first location that takes the write and drop any lower-priority
+    # lockfile left by an earlier run so readers cannot pick up a stale port/token
+    candidates = [
+        ("ProgramData", Path(os.environ.get("ProgramData") or os.getcwd()) / "PLCLogger" / "agent" / "agent.lock.json"),
+    ]
+    base_local = os.environ.get("LOCALAPPDATA")
+    if base_local:
+        candidates.append(("LocalAppData", Path(base_local) / "PLCLogger" / "agent" / "agent.lock.json"))
+    candidates.append(("cwd", Path.cwd() / "agent.dev.lock.json"))
+    for i, (label, path) in enumerate(candidates):
         try:
-            path = Path.cwd() / "agent.dev.lock.json"
-            path.write_text(json.dumps(data))
-            print(f"Lockfile (cwd): {path}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write a sibling temp file and rename over the lockfile so readers
+            # never see it truncated
+            tmp = path.with_suffix(".json.tmp")
+            tmp.write_text(text)
+            os.replace(tmp, path)
+            print(f"Lockfile ({label}): {path}")
         except Exception as e:
-            print("Lockfile write failed (cwd):", e, file=sys.stderr)
+            print(f"Lockfile write failed ({label}):", e, file=sys.stderr)
+            continue
+        for stale_label, stale in candidates[i + 1:]:
+            try:
+                stale.unlink()
+                print(f"Removed stale lockfile ({stale_label}): {stale}")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Stale lockfile removal failed ({stale_label}):", e, file=sys.stderr)
+        return
 
 
 def main():
@@ -0,0 +1,61 @@
+import threading
+import unittest
+from unittest import mock
+
+from plc_agent import metrics
+
+
+class _Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class JobMetricsLateEventsTest(unittest.TestCase):
+    def _reads_in_thread(self, m: metrics.JobMetrics, n: int):
+        # Record n reads from a thread that stays alive (its buffer is not applied
+        # until a reader drains it); returns the event releasing the thread
+        recorded = threading.Event()
+        release = threading.Event()
+
+        def run() -> None:
+            for _ in range(n):
+                m.record_read(1.0, ok=True)
+            recorded.set()
+            release.wait()
+
+        th = threading.Thread(target=run, daemon=True)
+        th.start()
+        recorded.wait()
+        self.addCleanup(th.join)
+        self.addCleanup(release.set)
+
+    def test_reads_older_than_ring_are_not_counted_now(self) -> None:
+        clock = _Clock(1000.5)
+        with mock.patch.object(metrics.time, "monotonic", clock):
+            m = metrics.JobMetrics("job")
+            self._reads_in_thread(m, 100)
+            clock.now = 1300.5
+            m.record_write(2.0, ok=True, rows=1, table_id=None, target_id=None)
+            summary = m.summary_last_secs(60)
+            self.assertEqual(summary["reads"], 0)
+            self.assertEqual(summary["writes"], 1)
+            self.assertEqual([p["reads"] for p in m.timeseries(900)], [0])
+
+    def test_late_reads_count_in_their_own_second(self) -> None:
+        clock = _Clock(1000.5)
+        with mock.patch.object(metrics.time, "monotonic", clock):
+            m = metrics.JobMetrics("job")
+            self._reads_in_thread(m, 100)
+            clock.now = 1010.5
+            m.record_write(2.0, ok=True, rows=1, table_id=None, target_id=None)
+            self.assertEqual(m.summary_last_secs(60)["reads"], 100)
+            self.assertEqual(m.summary_last_secs(5)["reads"], 0)
+            series = {p["ts"]: (p["reads"], p["writes"]) for p in m.timeseries(900)}
+            self.assertEqual(series, {metrics.wall_ts(1000): (100, 0), metrics.wall_ts(1010): (0, 1)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -825,8 +825,9 @@ export function Networking({ onProceed }) {
                   g.ports && g.ports.length ? g.ports.join(",") : "";
                 const status =
                   g.status ||
-                  ((Array.isArray(g.last_tcp) &&
-                    g.last_tcp.some((r) => r.status === "open")) ||
+                  ((Array.isArray(g.last_tcp)
+                    ? g.last_tcp.some((r) => r.status === "open")
+                    : g.last_tcp?.open_ports?.length > 0) ||
                   g.last_ping?.ok
                     ? "reachable"
                     : "unknown");
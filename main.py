@@ -59,14 +59,100 @@ here should serve as a blueprint for further development.
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import json
+import operator
 import os
+import queue
 import random
 import sqlite3
+import struct
 import threading
 import time
+import urllib.parse
+import zlib
+from array import array
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:  # optional: apsw binds parameters without sqlite3's per-value adapter layer
+    import apsw as _apsw
+except ImportError:
+    _apsw = None
+
+# Logged rows are buffered per job and written in one transaction once this many
+# have accumulated, or after FLUSH_TICKS ticks, whichever comes first
+FLUSH_ROWS = 100
+FLUSH_TICKS = 10
+
+# A SqliteWriter gathers submitted batches for up to this long (or until
+# WRITER_MAX_ITEMS batches are queued) and commits them in one transaction
+WRITER_FLUSH_MS = 200
+WRITER_MAX_ITEMS = 256
+
+# Applied to every logging connection.  WAL with synchronous=NORMAL makes a
+# commit a single WAL append with no fsync; the database stays consistent,
+# but the last few commits can be lost if the OS crashes or power fails
+# (an application crash loses nothing).  Readers are not blocked by the logger.
+LOG_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+
+# Optional custom SQLite VFS for logging databases, as (path of the loadable
+# extension that registers it, VFS name) -- e.g. an io_uring-backed shim for
+# high-rate deployments.  Only used on Linux 5.6+ and only through the sqlite3
+# module; None (the default) keeps SQLite's built-in VFS.
+LOG_DB_VFS: Optional[Tuple[str, str]] = None
+
+_vfs_lock = threading.Lock()
+_vfs_name: Optional[str] = None
+_vfs_tried = False
+
+
+def _log_db_vfs() -> Optional[str]:
+    """Register LOG_DB_VFS once and return its name, or None to use the default."""
+    global _vfs_name, _vfs_tried
+    if LOG_DB_VFS is None:
+        return None
+    with _vfs_lock:
+        if _vfs_tried:
+            return _vfs_name
+        _vfs_tried = True
+        ext_path, name = LOG_DB_VFS
+        try:
+            release = os.uname().release.split("-")[0].split(".")
+            if os.uname().sysname != "Linux" or tuple(int(x) for x in release[:2]) < (5, 6):
+                print("LOG_DB_VFS needs Linux 5.6 or newer; using the default VFS.")
+                return None
+            # A loaded VFS is registered process-wide, so any connection will do
+            boot = sqlite3.connect(":memory:")
+            try:
+                boot.enable_load_extension(True)
+                boot.load_extension(ext_path)
+            finally:
+                boot.close()
+        except Exception as e:
+            print(f"Could not load SQLite VFS from {ext_path}: {e}; using the default VFS.")
+            return None
+        _vfs_name = name
+        return name
+
+
+def _apply_pragmas(db: Any) -> None:
+    # Works on a sqlite3 connection or cursor, or an apsw cursor
+    for pragma in LOG_DB_PRAGMAS:
+        db.execute(pragma)
+
+
+def _log_table_sql(table_name: str, schema: "ParentSchema") -> str:
+    cols_sql = ", ".join(f"{f.name} REAL" for f in schema.fields)
+    return f"CREATE TABLE IF NOT EXISTS {table_name} (timestamp_utc INTEGER, {cols_sql})"
+
 
 ################################################################################
 # Data model classes
@@ -182,12 +268,446 @@ class Trigger:
     deadband: float = 0.0
 
 
+################################################################################
+# Database writer
+################################################################################
+
+
+class SqliteWriter:
+    """Owns the connection to one SQLite file and performs all writes to it.
+
+    Jobs logging into the same file submit row batches here instead of
+    opening their own connections, so they never contend for the file's
+    write lock.  A background thread gathers whatever was submitted within
+    WRITER_FLUSH_MS and commits it as one transaction (one executemany per
+    INSERT statement).
+
+    When apsw is installed the file is opened through it instead of the
+    sqlite3 module; its executemany binds each value straight onto the
+    prepared statement, which roughly halves the binding cost for wide
+    numeric rows.
+
+    Args:
+        db_path: Path to the SQLite database file.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        # Items are (sql, rows); sql None marks a control item whose second
+        # element is an Event to set once committed, or None to stop
+        self._q: "queue.SimpleQueue[Tuple[Optional[str], Any]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._db: Any = None  # sqlite3.Connection or apsw.Connection
+        self._cursor: Any = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        # Autocommit mode: transactions are opened explicitly in _commit.  The
+        # connection is shared with callers of execute(), hence check_same_thread=False
+        # (apsw connections are autocommit and usable from any thread already)
+        vfs = _log_db_vfs()
+        if vfs is not None:
+            uri = f"file:{urllib.parse.quote(os.path.abspath(self.db_path))}?vfs={vfs}"
+            db = sqlite3.connect(uri, uri=True, isolation_level=None, check_same_thread=False)
+        elif _apsw is not None:
+            db = _apsw.Connection(self.db_path)
+        else:
+            db = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        self._db = db
+        # All statements go through one cursor; both modules keep each parsed
+        # INSERT in a per-connection statement cache
+        self._cursor = db.cursor()
+        _apply_pragmas(self._cursor)
+        self._thread = threading.Thread(target=self._loop, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Commit everything submitted so far, then close the connection."""
+        if self._thread is None:
+            return
+        self._q.put((None, None))
+        self._thread.join()
+        self._thread = None
+        self._cursor = None
+        self._db.close()
+        self._db = None
+
+    def execute(self, sql: str) -> None:
+        """Run a statement (e.g. DDL) right away, outside the write queue."""
+        with self._lock:
+            self._cursor.execute(sql)
+
+    def query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        """Run a SELECT right away and return all of its rows."""
+        with self._lock:
+            return list(self._cursor.execute(sql, params))
+
+    def submit(self, sql: str, rows: List[Tuple[Any, ...]]) -> None:
+        """Queue rows for ``executemany(sql, rows)`` in the next transaction."""
+        self._q.put((sql, rows))
+
+    def flush(self) -> None:
+        """Block until everything submitted so far is committed."""
+        done = threading.Event()
+        self._q.put((None, done))
+        done.wait()
+
+    def _loop(self) -> None:
+        q = self._q
+        while True:
+            items = [q.get()]
+            deadline = time.monotonic() + WRITER_FLUSH_MS / 1000.0
+            # Gather more work until the window closes; a control item ends it early
+            while items[-1][0] is not None and len(items) < WRITER_MAX_ITEMS:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(q.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if self._commit(items):
+                return
+
+    def _commit(self, items: List[Tuple[Optional[str], Any]]) -> bool:
+        # Group rows by statement, commit them together, then signal waiters.
+        # Returns True when a stop item was seen
+        batches: Dict[str, List[List[Tuple[Any, ...]]]] = {}
+        waiters: List[threading.Event] = []
+        stop = False
+        for sql, rows in items:
+            if sql is not None:
+                batches.setdefault(sql, []).append(rows)
+            elif rows is None:
+                stop = True
+            else:
+                waiters.append(rows)
+        if batches:
+            with self._lock:
+                cur = self._cursor
+                cur.execute("BEGIN")
+                try:
+                    # One executemany per statement, fed straight from the
+                    # submitted lists without concatenating them
+                    for sql, parts in batches.items():
+                        cur.executemany(sql, itertools.chain.from_iterable(parts))
+                    cur.execute("COMMIT")
+                except Exception as e:
+                    cur.execute("ROLLBACK")
+                    dropped = sum(len(rows) for parts in batches.values() for rows in parts)
+                    print(f"Write to {self.db_path} failed, {dropped} rows dropped: {e}")
+        for done in waiters:
+            done.set()
+        return stop
+
+
+################################################################################
+# Packed (compressed) storage
+################################################################################
+
+
+def _put_uvarint(out: bytearray, v: int) -> None:
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+def _get_uvarint(buf: bytes, pos: int) -> Tuple[int, int]:
+    v = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        v |= (b & 0x7F) << shift
+        if b < 0x80:
+            return v, pos
+        shift += 7
+
+
+def _zigzag(v: int) -> int:
+    return v << 1 if v >= 0 else ((-v) << 1) - 1
+
+
+def _unzigzag(u: int) -> int:
+    return u >> 1 if not u & 1 else -((u + 1) >> 1)
+
+
+_F64 = struct.Struct("<d")
+
+
+def _f64_bits(x: float) -> int:
+    return int.from_bytes(_F64.pack(x), "little")
+
+
+def _bits_f64(b: int) -> float:
+    return _F64.unpack(b.to_bytes(8, "little"))[0]
+
+
+def encode_packed(rows: List[Tuple[Any, ...]], ncols: int) -> bytes:
+    """Encode (timestamp, value, ...) rows into a compressed payload.
+
+    Timestamps are stored as zigzag varint delta-of-deltas, so a fixed
+    interval costs one byte per row.  Each column is stored as a separate
+    stream of varints holding the XOR of the value's float64 bits with the
+    previous value's (Gorilla style), shifted left one bit; a lone 1 marks
+    None.  The streams are then zlib-compressed.
+    """
+    out = bytearray()
+    _put_uvarint(out, len(rows))
+    _put_uvarint(out, ncols)
+    prev_ts = prev_delta = 0
+    for row in rows:
+        ts = int(row[0])
+        delta = ts - prev_ts
+        _put_uvarint(out, _zigzag(delta - prev_delta))
+        prev_ts, prev_delta = ts, delta
+    for c in range(1, ncols + 1):
+        prev = 0
+        for row in rows:
+            v = row[c]
+            if v is None:
+                out.append(1)
+                continue
+            bits = _f64_bits(float(v))
+            _put_uvarint(out, (bits ^ prev) << 1)
+            prev = bits
+    return zlib.compress(bytes(out))
+
+
+def decode_packed(payload: bytes) -> List[Tuple[Any, ...]]:
+    """Inverse of encode_packed: returns the (timestamp, value, ...) rows."""
+    buf = zlib.decompress(payload)
+    n, pos = _get_uvarint(buf, 0)
+    ncols, pos = _get_uvarint(buf, pos)
+    cols: List[List[Any]] = []
+    ts_col = []
+    prev_ts = prev_delta = 0
+    for _ in range(n):
+        u, pos = _get_uvarint(buf, pos)
+        prev_delta += _unzigzag(u)
+        prev_ts += prev_delta
+        ts_col.append(prev_ts)
+    cols.append(ts_col)
+    for _ in range(ncols):
+        col: List[Any] = []
+        prev = 0
+        for _ in range(n):
+            u, pos = _get_uvarint(buf, pos)
+            if u == 1:
+                col.append(None)
+                continue
+            prev ^= u >> 1
+            col.append(_bits_f64(prev))
+        cols.append(col)
+    return list(zip(*cols))
+
+
+class CompressedBatchWriter:
+    """Packs logged rows into one compressed BLOB row per batch.
+
+    Rows go to ``{table}_packed(bucket_start, bucket_end, n, payload)``, where
+    the bucket bounds are the first and last timestamps of the batch.  Rows
+    still buffered are only on disk after flush(), so up to ``batch`` rows can
+    be lost if the process dies.
+
+    Args:
+        writer: SqliteWriter for the database holding the table.
+        table: Base table name; the packed table name is derived from it.
+        ncols: Number of value columns after the timestamp.
+        batch: Rows per packed BLOB.
+    """
+
+    def __init__(self, writer: "SqliteWriter", table: str, ncols: int, batch: int = 1024) -> None:
+        self.writer = writer
+        self.ncols = ncols
+        self.batch = batch
+        self._rows: List[Tuple[Any, ...]] = []
+        self._insert_sql = f"INSERT INTO {table}_packed (bucket_start, bucket_end, n, payload) VALUES (?, ?, ?, ?)"
+
+    @staticmethod
+    def create_table_sql(table: str) -> str:
+        return (
+            f"CREATE TABLE IF NOT EXISTS {table}_packed "
+            f"(bucket_start INTEGER, bucket_end INTEGER, n INTEGER, payload BLOB)"
+        )
+
+    def extend(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Buffer rows, writing every full batch."""
+        self._rows.extend(rows)
+        while len(self._rows) >= self.batch:
+            chunk = self._rows[:self.batch]
+            self._write(chunk)
+            del self._rows[:self.batch]
+
+    def flush(self) -> None:
+        """Write the buffered rows as a (possibly short) batch."""
+        if self._rows:
+            self._write(self._rows)
+            self._rows = []
+
+    def _write(self, rows: List[Tuple[Any, ...]]) -> None:
+        payload = encode_packed(rows, self.ncols)
+        self.writer.submit(self._insert_sql, [(int(rows[0][0]), int(rows[-1][0]), len(rows), payload)])
+
+
+def iter_packed_rows(
+    db: sqlite3.Connection, table: str, start: Optional[int] = None, end: Optional[int] = None
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield decoded (timestamp, value, ...) rows of a packed table in time order.
+
+    Only batches overlapping [start, end] are decompressed.
+    """
+    lo = start if start is not None else -(1 << 62)
+    hi = end if end is not None else 1 << 62
+    cur = db.execute(
+        f"SELECT payload FROM {table}_packed WHERE bucket_end >= ? AND bucket_start <= ? ORDER BY bucket_start",
+        (lo, hi),
+    )
+    for (payload,) in cur:
+        for row in decode_packed(payload):
+            if lo <= row[0] <= hi:
+                yield row
+
+
+class JobScheduler:
+    """Runs the ticks of many logging jobs from a single thread.
+
+    Jobs sit in a heap keyed by their next monotonic deadline.  The thread
+    sleeps until the earliest one, runs that job's tick and re-queues it one
+    interval later, so job count costs heap entries rather than OS threads.
+    A job that overruns is realigned to "now" instead of bursting to catch up.
+    """
+
+    def __init__(self) -> None:
+        # (deadline_ns, seq, token, job); an entry is live while job._sched_token is token
+        self._heap: List[Tuple[int, int, object, "LoggingJob"]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running: Optional["LoggingJob"] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def add(self, job: "LoggingJob") -> None:
+        """Schedule job, with its first tick due immediately."""
+        with self._cond:
+            token = job._sched_token = object()
+            heapq.heappush(self._heap, (time.monotonic_ns(), next(self._seq), token, job))
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._loop, name="job-scheduler", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def remove(self, job: "LoggingJob") -> None:
+        """Unschedule job; returns once no tick of it is running."""
+        with self._cond:
+            # The heap entry is dropped lazily when it reaches the top
+            job._sched_token = None
+            while self._running is job:
+                self._cond.wait()
+
+    def stop(self) -> None:
+        with self._cond:
+            if self._thread is None:
+                return
+            self._stopping = True
+            self._cond.notify()
+            thread = self._thread
+        thread.join()
+        with self._cond:
+            self._thread = None
+
+    def _loop(self) -> None:
+        heap = self._heap
+        cond = self._cond
+        with cond:
+            while not self._stopping:
+                if not heap:
+                    cond.wait()
+                    continue
+                deadline, _, token, job = heap[0]
+                if job._sched_token is not token:
+                    heapq.heappop(heap)
+                    continue
+                delay_ns = deadline - time.monotonic_ns()
+                if delay_ns > 0:
+                    cond.wait(delay_ns / 1e9)
+                    continue
+                heapq.heappop(heap)
+                self._running = job
+                cond.release()
+                try:
+                    job._tick()
+                except Exception as e:
+                    print(f"Job on {job.device.name} tick failed: {e}")
+                finally:
+                    cond.acquire()
+                    self._running = None
+                    cond.notify_all()
+                if job._sched_token is token:
+                    nxt = deadline + job.interval_ms * 1_000_000
+                    now = time.monotonic_ns()
+                    if nxt < now:
+                        nxt = now
+                    heapq.heappush(heap, (nxt, next(self._seq), token, job))
+
+
+# Comparison operators supported by threshold triggers
+_TRIGGER_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# (values, last_values) -> True when the trigger fires; both are lists in
+# schema column order
+TriggerFn = Callable[[List[Any], List[Any]], bool]
+
+
+def scale_row(raw: List[Any], slots: List[int], scales: List[float], width: int) -> List[Any]:
+    """Build one row of ``width`` values from raw readings.
+
+    ``raw[k]`` times ``scales[k]`` lands in column ``slots[k]``; unmapped
+    columns and readings that are None or not numeric stay None.  Takes no
+    job or device state, so it can be compiled on its own (e.g. with Cython).
+    """
+    values: List[Any] = [None] * width
+    for i, raw_value, scale in zip(slots, raw, scales):
+        if raw_value is not None:
+            try:
+                values[i] = float(raw_value) * scale
+            except (TypeError, ValueError):
+                pass
+    return values
+
+
 class LoggingJob:
     """A job that periodically polls a device and writes rows to the database.
 
-    The job runs in a background thread.  Continuous jobs collect values on
+    The job's ticks are run by a JobScheduler.  Continuous jobs collect values on
     every tick based on the configured interval.  Trigger jobs only write
-    a row when at least one trigger condition is satisfied.
+    a row when at least one trigger condition is satisfied.  Rows are
+    buffered and handed to the database's SqliteWriter in batches (see
+    FLUSH_ROWS/FLUSH_TICKS); stopping the job flushes the rest.  Without a
+    shared ``writer`` (or ``scheduler``) the job starts a private one.
+    With ``packed=True`` rows are stored compressed through
+    CompressedBatchWriter instead of one SQL row per sample.
+
+    Setting ``force_interval_ms`` turns on deadband filtering for continuous
+    jobs: a row is only written when some mapped field moved by more than its
+    mapping's deadband since the last written row, or when force_interval_ms
+    has passed without one (a heartbeat row).
+
+    With ``partitioned=True`` rows go to one table per UTC day,
+    ``<table>_YYYYMMDD``, so range scans only touch the days they cover.
+    If ``retention_days`` is set, day tables older than that are dropped
+    whenever a new day's table is opened.  ``partitioned`` cannot be combined
+    with ``packed``.
     """
 
     def __init__(
@@ -197,145 +717,262 @@ class LoggingJob:
         job_type: str = "continuous",
         interval_ms: int = 1000,
         triggers: Optional[List[Trigger]] = None,
+        packed: bool = False,
+        writer: Optional[SqliteWriter] = None,
+        scheduler: Optional[JobScheduler] = None,
+        force_interval_ms: Optional[int] = None,
+        partitioned: bool = False,
+        retention_days: Optional[int] = None,
     ) -> None:
         if job_type not in ("continuous", "trigger"):
             raise ValueError("job_type must be 'continuous' or 'trigger'")
+        if packed and partitioned:
+            # Packed rows go to a single {table}_packed table that day tables never create
+            raise ValueError("packed and partitioned storage cannot be combined")
         self.device = device
         self.parent_schema = parent_schema
         self.job_type = job_type
         self.interval_ms = interval_ms
         self.triggers = triggers or []
-        self._thread: Optional[threading.Thread] = None
-        self._stop_event = threading.Event()
-        # Maintain last logged values for change detection
-        self._last_values: Dict[str, Any] = {}
+        self.packed = packed
+        self.force_interval_ms = force_interval_ms
+        self.partitioned = partitioned
+        self.retention_days = retention_days
+        # Column order and insert statement are fixed by the schema
+        self._column_names: Tuple[str, ...] = tuple(f.name for f in parent_schema.fields)
+        placeholders = ", ".join("?" for _ in self._column_names)
+        self._insert_tail = f"(timestamp_utc, {', '.join(self._column_names)}) VALUES (?, {placeholders})"
+        self._insert_sql = f"INSERT INTO {device.get_table_name()} {self._insert_tail}"
+        # UTC day number -> insert statement for that day's table (partitioned only)
+        self._partition_sql: Dict[int, str] = {}
+        # Triggers compiled once into predicates over (values, last_values)
+        self._trigger_fns: List[TriggerFn] = [self._compile(t, self._column_names) for t in self.triggers]
+        # Shared scheduler, or a private one created by start()
+        self._scheduler = scheduler
+        self._own_scheduler = scheduler is None
+        # Set by the scheduler while the job is scheduled
+        self._sched_token: Optional[object] = None
+        self._conn: Optional[SimulatedDeviceConnection] = None
+        self._ticks = 0
+        # monotonic_ns of the last buffered row (heartbeat for deadband filtering)
+        self._last_log_ns = 0
+        # Maintain last logged values (schema column order) for change detection
+        self._last_values: List[Any] = [None] * len(self._column_names)
+        # Shared writer for device.db_path, or a private one started by start()
+        self._writer = writer
+        self._own_writer = writer is None
+        # Rows waiting for _flush, stored by column: timestamps plus one list per field
+        self._pending_ts = array("q")
+        self._pending_cols: List[List[Any]] = [[] for _ in self._column_names]
+        self._push_values = self._make_pusher(self._pending_cols)
+        self._packer: Optional[CompressedBatchWriter] = None
+
+    def is_running(self) -> bool:
+        return self._sched_token is not None
 
     def start(self) -> None:
-        if self._thread and self._thread.is_alive():
+        if self.is_running():
             print(f"Job on {self.device.name} is already running.")
             return
-        self._stop_event.clear()
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
+        self._prepare_storage()
+        # Acquire a simulated connection for the device
+        self._conn = SimulatedDeviceConnection(self.device)
+        self._ticks = 0
+        if self._own_scheduler:
+            self._scheduler = JobScheduler()
+        self._scheduler.add(self)
         print(f"Started {self.job_type} job on {self.device.name} (interval {self.interval_ms} ms).")
 
     def stop(self) -> None:
-        if not self._thread:
+        if not self.is_running():
             print(f"Job on {self.device.name} is not running.")
             return
-        self._stop_event.set()
-        self._thread.join()
-        self._thread = None
+        self._scheduler.remove(self)
+        if self._own_scheduler:
+            self._scheduler.stop()
+        self._flush()
+        if self._packer is not None:
+            self._packer.flush()
+            self._packer = None
+        if self._own_writer:
+            self._writer.stop()
+        else:
+            # Rows are on disk once stop() returns
+            self._writer.flush()
         print(f"Stopped job on {self.device.name}.")
 
-    def _run(self) -> None:
-        # Create table if not exists
-        self._ensure_table()
-        # Acquire a simulated connection for the device
-        conn = SimulatedDeviceConnection(self.device)
-        # Determine column names
-        column_names = [f.name for f in self.parent_schema.fields]
-        # Build insert statement
-        placeholders = ", ".join(["?" for _ in column_names])
-        insert_sql = (
-            f"INSERT INTO {self.device.get_table_name()} "
-            f"(timestamp_utc, {', '.join(column_names)}) "
-            f"VALUES (?, {placeholders})"
-        )
+    def _prepare_storage(self) -> None:
+        """Start the writer if the job owns it and make sure the table exists."""
+        if self._own_writer:
+            self._writer = SqliteWriter(self.device.db_path)
+            self._writer.start()
+        try:
+            self._ensure_table()
+        except Exception:
+            if self._own_writer:
+                self._writer.stop()
+            raise
+        if self.packed:
+            self._packer = CompressedBatchWriter(self._writer, self.device.get_table_name(), len(self._column_names))
+
+    def _tick(self) -> None:
+        """Poll the device once and buffer a row if it should be logged."""
+        column_names = self._column_names
+        # Determine values for each field (based on per‑field poll periods if provided)
+        now = int(time.time())
+        mappings = self.device.mappings
+        slots = [i for i, c in enumerate(column_names) if mappings.get(c) is not None]
+        mapped = [mappings[column_names[i]] for i in slots]
+        # For continuous jobs we ignore per‑field poll rates and always read
+        # For trigger jobs we may need to read anyway to evaluate triggers
+        raw = self._conn.read_many(mapped)
+        values = scale_row(raw, slots, [m.scale for m in mapped], len(column_names))
+
+        # Determine whether to write
+        should_log = False
+        if self.job_type == "continuous":
+            should_log = self.force_interval_ms is None or self._outside_deadband(values, slots, mapped)
+            if not should_log:
+                should_log = time.monotonic_ns() - self._last_log_ns >= self.force_interval_ms * 1_000_000
+        else:
+            # Trigger job: log when any condition holds
+            last = self._last_values
+            should_log = any(fn(values, last) for fn in self._trigger_fns)
+        if should_log:
+            # Update last values for change detection
+            self._last_values = values
+            self._last_log_ns = time.monotonic_ns()
+            self._pending_ts.append(now)
+            self._push_values(values)
+        self._ticks += 1
+        if len(self._pending_ts) >= FLUSH_ROWS or self._ticks >= FLUSH_TICKS:
+            self._flush()
+            self._ticks = 0
+
+    @staticmethod
+    def _make_pusher(cols: List[List[Any]]) -> Callable[[List[Any]], None]:
+        """Build ``push(values)`` appending values[k] to cols[k] for this schema width.
+
+        Generated once per job so each tick runs straight-line appends with
+        constant indexes instead of a zip loop.  The column lists are only ever
+        cleared in place, so the bound appends stay valid.
+        """
+        ns: Dict[str, Any] = {f"a{k}": col.append for k, col in enumerate(cols)}
+        body = "".join(f"\n    a{k}(v[{k}])" for k in range(len(cols))) or "\n    pass"
+        exec(f"def push(v):{body}", ns)
+        return ns["push"]
+
+    def _outside_deadband(self, values: List[Any], slots: List[int], mapped: List[Mapping]) -> bool:
+        """True if any mapped field changed by more than its deadband since the last row."""
+        last = self._last_values
+        for i, mapping in zip(slots, mapped):
+            val = values[i]
+            prev = last[i]
+            if val is None or prev is None:
+                if val is not prev:
+                    return True
+            elif abs(val - prev) > mapping.deadband:
+                return True
+        return False
 
-        while not self._stop_event.is_set():
-            # Determine values for each field (based on per‑field poll periods if provided)
-            now = int(time.time())
-            values: Dict[str, Any] = {}
-            for field in self.parent_schema.fields:
-                mapping = self.device.mappings.get(field.name)
-                if mapping is None:
-                    # Unmapped fields get None
-                    values[field.name] = None
-                    continue
-                # For continuous jobs we ignore per‑field poll rates and always read
-                # For trigger jobs we may need to read anyway to evaluate triggers
-                raw_value = conn.read(mapping)
-                # Apply scaling
-                try:
-                    scaled = float(raw_value) * mapping.scale if raw_value is not None else None
-                except Exception:
-                    scaled = None
-                values[field.name] = scaled
-
-            # Determine whether to write
-            should_log = False
-            if self.job_type == "continuous":
-                should_log = True
-            else:
-                # Trigger job: check conditions
-                for trig in self.triggers:
-                    val = values.get(trig.field_name)
-                    prev = self._last_values.get(trig.field_name)
-                    if val is None:
-                        continue
-                    if trig.op == "change":
-                        if prev is None or abs(val - prev) > max(trig.deadband, 0.0):
-                            should_log = True
-                            break
-                    elif trig.op in (">", ">=", "<", "<=", "==", "!="):
-                        # Only support numeric comparisons for simplicity
-                        if prev is None:
-                            # Evaluate against threshold only
-                            if self._evaluate(val, trig.op, trig.value):
-                                should_log = True
-                                break
-                        else:
-                            if self._evaluate(val, trig.op, trig.value):
-                                should_log = True
-                                break
-                    else:
-                        print(f"Unsupported trigger operator: {trig.op}")
-                # Save last values for change detection
-            if should_log:
-                # Update last values for change detection
-                for f, v in values.items():
-                    self._last_values[f] = v
-                self._write_row(insert_sql, now, [values[c] for c in column_names])
-            # Sleep until next interval
-            time.sleep(self.interval_ms / 1000.0)
-
-    def _evaluate(self, val: float, op: str, threshold: Optional[float]) -> bool:
+    @staticmethod
+    def _compile(trig: Trigger, column_names: Tuple[str, ...]) -> TriggerFn:
+        """Build the predicate for one trigger.
+
+        Fields that read as None (or are not in the schema) never fire.
+        'change' fires on the first value or when the value moves by more than
+        the deadband; comparison ops (numeric only) test the value against the
+        threshold.
+        """
+        if trig.field_name not in column_names:
+            return lambda values, last: False
+        i = column_names.index(trig.field_name)
+        if trig.op == "change":
+            deadband = max(trig.deadband, 0.0)
+
+            def changed(values: List[Any], last: List[Any]) -> bool:
+                val = values[i]
+                if val is None:
+                    return False
+                prev = last[i]
+                return prev is None or abs(val - prev) > deadband
+
+            return changed
+        op = _TRIGGER_OPS.get(trig.op)
+        if op is None:
+            print(f"Unsupported trigger operator: {trig.op}")
+            return lambda values, last: False
+        threshold = trig.value
         if threshold is None:
-            return False
-        if op == ">":
-            return val > threshold
-        elif op == ">=":
-            return val >= threshold
-        elif op == "<":
-            return val < threshold
-        elif op == "<=":
-            return val <= threshold
-        elif op == "==":
-            return val == threshold
-        elif op == "!=":
-            return val != threshold
-        return False
+            return lambda values, last: False
+
+        def compare(values: List[Any], last: List[Any]) -> bool:
+            val = values[i]
+            return val is not None and op(val, threshold)
+
+        return compare
 
     def _ensure_table(self) -> None:
-        """Creates the logging table if it does not already exist."""
-        db_path = self.device.db_path
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        with sqlite3.connect(db_path) as db:
-            cols = [f"{f.name} REAL" for f in self.parent_schema.fields]
-            cols_sql = ", ".join(cols)
-            table_name = self.device.get_table_name()
-            db.execute(
-                f"CREATE TABLE IF NOT EXISTS {table_name} "
-                f"(timestamp_utc INTEGER, {cols_sql})"
-            )
-            db.commit()
+        """Creates the logging table if it does not already exist.
 
-    def _write_row(self, insert_sql: str, timestamp: int, values: List[Any]) -> None:
-        db_path = self.device.db_path
-        with sqlite3.connect(db_path) as db:
-            db.execute(insert_sql, (timestamp, *values))
-            db.commit()
+        Partitioned jobs create their day tables on first use instead.
+        """
+        table_name = self.device.get_table_name()
+        if self.partitioned:
+            self._partition_sql.clear()
+            return
+        self._create_table(table_name)
+        if self.packed:
+            self._writer.execute(CompressedBatchWriter.create_table_sql(table_name))
+
+    def _create_table(self, table_name: str) -> None:
+        self._writer.execute(_log_table_sql(table_name, self.parent_schema))
+
+    def _partition_insert(self, day: int) -> str:
+        """Return the insert statement for a UTC day, creating its table on first use."""
+        sql = self._partition_sql.get(day)
+        if sql is None:
+            base = self.device.get_table_name()
+            table_name = f"{base}_{time.strftime('%Y%m%d', time.gmtime(day * 86400))}"
+            self._create_table(table_name)
+            if self.retention_days is not None:
+                self._drop_expired(base, day - self.retention_days)
+            sql = self._partition_sql[day] = f"INSERT INTO {table_name} {self._insert_tail}"
+        return sql
+
+    def _drop_expired(self, base: str, first_kept_day: int) -> None:
+        """Drop day tables of ``base`` dated before first_kept_day."""
+        cutoff = time.strftime("%Y%m%d", time.gmtime(first_kept_day * 86400))
+        names = self._writer.query(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ? ESCAPE '\\'",
+            (base.replace("_", "\\_") + "\\_%",),
+        )
+        for (name,) in names:
+            suffix = name[len(base) + 1:]
+            if len(suffix) == 8 and suffix.isdigit() and suffix < cutoff:
+                # Pending rows for an expired day would only be dropped again
+                self._writer.flush()
+                self._writer.execute(f"DROP TABLE IF EXISTS {name}")
+                print(f"Dropped expired partition {name}.")
+
+    def _flush(self) -> None:
+        """Hand all buffered rows to the writer as one batch."""
+        pending_ts = self._pending_ts
+        if not pending_ts:
+            return
+        # Rows are only assembled here, straight from the column buffers
+        rows = list(zip(pending_ts, *self._pending_cols))
+        if self._packer is not None:
+            self._packer.extend(rows)
+        elif self.partitioned:
+            # Rows are in time order, so each day is one contiguous run
+            for day, day_rows in itertools.groupby(rows, key=lambda r: r[0] // 86400):
+                self._writer.submit(self._partition_insert(day), list(day_rows))
+        else:
+            self._writer.submit(self._insert_sql, rows)
+        del pending_ts[:]
+        for col in self._pending_cols:
+            col.clear()
 
 
 ################################################################################
@@ -353,35 +990,200 @@ class SimulatedDeviceConnection:
 
     def __init__(self, device: DeviceTable) -> None:
         self.device = device
-        # Store state per address to generate repeatable sequences
-        self._state: Dict[str, float] = {}
+        # Store state per address to generate repeatable sequences.  Each
+        # (protocol, address) gets a slot in _state (None until first read)
+        self._state: List[Any] = []
+        self._addr_slot: Dict[Tuple[str, str], int] = {}
+        # id(mapping) -> (mapping, slot); keeping the mapping referenced stops
+        # its id from being reused by another object
+        self._mapping_slot: Dict[int, Tuple[Mapping, int]] = {}
+        for mapping in device.mappings.values():
+            if mapping is not None:
+                self._slot(mapping)
+
+    def _slot(self, mapping: Mapping) -> int:
+        hit = self._mapping_slot.get(id(mapping))
+        if hit is not None and hit[0] is mapping:
+            return hit[1]
+        key = (mapping.protocol, mapping.address)
+        slot = self._addr_slot.get(key)
+        if slot is None:
+            slot = self._addr_slot[key] = len(self._state)
+            self._state.append(None)
+        self._mapping_slot[id(mapping)] = (mapping, slot)
+        return slot
 
     def read(self, mapping: Mapping) -> Any:
         """Return a simulated value for the given mapping."""
-        addr = f"{mapping.protocol}:{mapping.address}"
+        i = self._slot(mapping)
+        state = self._state
         if mapping.data_type == "bool":
             # Flip boolean with small probability
-            current = self._state.get(addr, 0.0)
+            current = state[i] or 0.0
             if random.random() < 0.05:
                 current = 1.0 - current
-            self._state[addr] = current
+            state[i] = current
             return bool(current)
         elif mapping.data_type in ("int", "float"):
-            current = self._state.get(addr, random.random() * 100.0)
+            current = state[i]
+            if current is None:
+                current = random.random() * 100.0
             # Random walk
             delta = random.uniform(-1.0, 1.0)
             current += delta
-            self._state[addr] = current
+            state[i] = current
             return int(current) if mapping.data_type == "int" else float(current)
         elif mapping.data_type == "str":
             # Return a random string from a fixed list
             choices = ["OK", "WARN", "ALARM"]
-            if addr not in self._state or random.random() < 0.1:
-                self._state[addr] = random.choice(choices)
-            return str(self._state[addr])
+            if state[i] is None or random.random() < 0.1:
+                state[i] = random.choice(choices)
+            return str(state[i])
         else:
             return None
 
+    def read_many(self, mappings: List[Mapping]) -> List[Any]:
+        """Return simulated values for several mappings in one call.
+
+        Equivalent to ``[self.read(m) for m in mappings]`` (a real connector
+        would issue one batched request here), but with the random source and
+        state lookups bound once for the whole batch.
+        """
+        state = self._state
+        slot_of = self._mapping_slot.get
+        rnd = random.random
+        out: List[Any] = []
+        append = out.append
+        for mapping in mappings:
+            hit = slot_of(id(mapping))
+            i = hit[1] if hit is not None and hit[0] is mapping else self._slot(mapping)
+            dtype = mapping.data_type
+            if dtype == "float" or dtype == "int":
+                current = state[i]
+                if current is None:
+                    current = rnd() * 100.0
+                # Random walk, uniform in [-1, 1)
+                current += rnd() * 2.0 - 1.0
+                state[i] = current
+                append(float(current) if dtype == "float" else int(current))
+            elif dtype == "bool":
+                current = state[i] or 0.0
+                if rnd() < 0.05:
+                    current = 1.0 - current
+                state[i] = current
+                append(bool(current))
+            else:
+                append(self.read(mapping))
+        return out
+
+
+################################################################################
+# OPC UA subscription connector
+################################################################################
+
+
+class OpcUaConnector:
+    """Logs a device's OPC UA mappings from server data-change notifications.
+
+    Instead of polling, each ``opc_ua`` mapping becomes a MonitoredItem on one
+    subscription; the server samples every ``period_ms`` and only reports a
+    node when its value changed (by more than the mapping's deadband, when
+    one is set).  Every notification writes a row holding the latest value of
+    each field, submitted to ``writer`` like a LoggingJob's batches.
+    Requires the ``opcua`` package.
+
+    Args:
+        device: Device whose mappings are subscribed.
+        parent_schema: Schema of the device table.
+        endpoint: Server URL, e.g. ``opc.tcp://localhost:4840/freeopcua/server/``.
+        writer: Started SqliteWriter for ``device.db_path``.
+        period_ms: Publishing interval of the subscription.
+    """
+
+    def __init__(
+        self,
+        device: DeviceTable,
+        parent_schema: ParentSchema,
+        endpoint: str,
+        writer: SqliteWriter,
+        period_ms: int = 1000,
+    ) -> None:
+        self.device = device
+        self.parent_schema = parent_schema
+        self.endpoint = endpoint
+        self.period_ms = period_ms
+        self._writer = writer
+        column_names = tuple(f.name for f in parent_schema.fields)
+        placeholders = ", ".join("?" for _ in column_names)
+        self._insert_sql = (
+            f"INSERT INTO {device.get_table_name()} "
+            f"(timestamp_utc, {', '.join(column_names)}) VALUES (?, {placeholders})"
+        )
+        # Latest value per column; notifications update one slot each
+        self._values: List[Any] = [None] * len(column_names)
+        # (column slot, mapping) for every OPC UA mapping of the device
+        self._mapped: List[Tuple[int, Mapping]] = []
+        for i, name in enumerate(column_names):
+            mapping = device.mappings.get(name)
+            if mapping is not None and mapping.protocol == "opc_ua":
+                self._mapped.append((i, mapping))
+        # NodeId -> (column slot, scale), filled by start()
+        self._slots: Dict[Any, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._client: Any = None
+        self._sub: Any = None
+
+    def start(self) -> None:
+        from opcua import Client  # optional dependency
+
+        self._writer.execute(_log_table_sql(self.device.get_table_name(), self.parent_schema))
+        client = Client(self.endpoint)
+        client.connect()
+        try:
+            sub = client.create_subscription(self.period_ms, self)
+            for i, mapping in self._mapped:
+                node = client.get_node(mapping.address)
+                self._slots[node.nodeid] = (i, mapping.scale)
+                if mapping.deadband > 0:
+                    # deadbandtype 1 = Absolute
+                    sub.deadband_monitor(node, mapping.deadband, deadbandtype=1, queuesize=1)
+                else:
+                    sub.subscribe_data_change(node, queuesize=1)
+        except Exception:
+            client.disconnect()
+            raise
+        self._client = client
+        self._sub = sub
+        print(f"Subscribed to {len(self._slots)} node(s) on {self.device.name}.")
+
+    def stop(self) -> None:
+        if self._client is None:
+            return
+        try:
+            self._sub.delete()
+        finally:
+            self._client.disconnect()
+            self._client = None
+            self._sub = None
+        self._writer.flush()
+        print(f"Unsubscribed from {self.device.name}.")
+
+    def datachange_notification(self, node: Any, val: Any, data: Any) -> None:
+        """Called by the opcua client thread for each changed node."""
+        hit = self._slots.get(node.nodeid)
+        if hit is None:
+            return
+        i, scale = hit
+        try:
+            value = float(val) * scale if val is not None else None
+        except Exception:
+            value = None
+        with self._lock:
+            self._values[i] = value
+            row = (int(time.time()), *self._values)
+        # SqliteWriter coalesces these single-row batches into one transaction
+        self._writer.submit(self._insert_sql, [row])
+
 
 ################################################################################
 # CLI application
@@ -396,6 +1198,19 @@ class LoggerApp:
         self.schemas: Dict[str, ParentSchema] = {}
         self.devices: Dict[str, DeviceTable] = {}
         self.jobs: List[LoggingJob] = []
+        # One writer per database file, shared by every job logging into it
+        self._writers: Dict[str, SqliteWriter] = {}
+        # Runs the ticks of every job
+        self._scheduler = JobScheduler()
+
+    def _writer_for(self, db_path: str) -> SqliteWriter:
+        key = os.path.abspath(db_path)
+        writer = self._writers.get(key)
+        if writer is None:
+            writer = SqliteWriter(db_path)
+            writer.start()
+            self._writers[key] = writer
+        return writer
 
     # ---------------------------------------------------------------------
     # Schema management
@@ -480,6 +1295,12 @@ class LoggerApp:
         if not db_path:
             print("DB path cannot be empty.")
             return
+        # Create the directory once here; writers opened later assume it exists
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        except OSError as e:
+            print(f"Cannot create directory for '{db_path}': {e}")
+            return
         # Create device and initialise mapping dict
         device = DeviceTable(name=name, schema_name=schema_name, db_path=db_path)
         # Initialise mapping entries to None
@@ -620,6 +1441,26 @@ class LoggerApp:
         except ValueError:
             print("Invalid interval. Using 1000 ms.")
             interval_ms = 1000
+        force_interval_ms = None
+        if job_type == "continuous":
+            try:
+                force_str = input(
+                    "Heartbeat ms for deadband filtering (blank logs every tick): "
+                ).strip()
+                force_interval_ms = int(force_str) if force_str else None
+            except ValueError:
+                print("Invalid heartbeat. Logging every tick.")
+        storage = input("Storage (rows/packed/daily) [rows]: ").strip().lower() or "rows"
+        if storage not in ("rows", "packed", "daily"):
+            print("Unsupported storage. Using rows.")
+            storage = "rows"
+        retention_days = None
+        if storage == "daily":
+            try:
+                keep_str = input("Days of data to keep (blank keeps all): ").strip()
+                retention_days = max(1, int(keep_str)) if keep_str else None
+            except ValueError:
+                print("Invalid retention. Keeping all days.")
         triggers: List[Trigger] = []
         if job_type == "trigger":
             print(
@@ -655,7 +1496,11 @@ class LoggerApp:
                         continue
                 triggers.append(Trigger(field_name=field_name, op=op, value=value, deadband=deadband))
         # Instantiate and start job
-        job = LoggingJob(device, schema, job_type, interval_ms, triggers)
+        job = LoggingJob(
+            device, schema, job_type, interval_ms, triggers,
+            packed=storage == "packed", writer=self._writer_for(device.db_path), scheduler=self._scheduler,
+            force_interval_ms=force_interval_ms, partitioned=storage == "daily", retention_days=retention_days,
+        )
         self.jobs.append(job)
         job.start()
         print(f"Job created and started for device '{device.name}'.")
@@ -666,7 +1511,7 @@ class LoggerApp:
             return
         for i, job in enumerate(self.jobs, 1):
             device_name = job.device.name
-            status = "running" if job._thread and job._thread.is_alive() else "stopped"
+            status = "running" if job.is_running() else "stopped"
             print(f"  {i}) Device: {device_name}, type: {job.job_type}, interval: {job.interval_ms} ms, status: {status}")
 
     def stop_job(self) -> None:
@@ -676,7 +1521,7 @@ class LoggerApp:
         # List jobs
         for i, job in enumerate(self.jobs, 1):
             device_name = job.device.name
-            status = "running" if job._thread and job._thread.is_alive() else "stopped"
+            status = "running" if job.is_running() else "stopped"
             print(f"  {i}) Device: {device_name}, type: {job.job_type}, status: {status}")
         try:
             choice = int(input("Select job to stop (number): ").strip())
@@ -719,6 +1564,9 @@ class LoggerApp:
                 # Stop all jobs before exiting
                 for job in self.jobs[:]:
                     job.stop()
+                self._scheduler.stop()
+                for writer in self._writers.values():
+                    writer.stop()
                 print("Exiting. Goodbye!")
                 break
             action = actions.get(choice)
@@ -4,10 +4,10 @@ client = Client("opc.tcp://localhost:4840/freeopcua/server/")
 client.connect()
 
 try:
-    for i in range(1, 11):
-        nodeid = f"ns=2;s=Device{i}.Temperature"
-        node = client.get_node(nodeid)
-        value = node.get_value()
+    # One Read request for all devices instead of a round trip per node
+    nodes = [client.get_node(f"ns=2;s=Device{i}.Temperature") for i in range(1, 11)]
+    values = client.get_values(nodes)
+    for i, value in enumerate(values, 1):
         print(f"Device{i} Temperature: {value}")
 finally:
-    client.disconnect()
\ No newline at end of file
+    client.disconnect()
@@ -1,7 +1,7 @@
 from opcua import Server, ua
+import sys
 import time
 import random
-from datetime import datetime
 
 # Set up the OPC UA server
 server = Server()
@@ -13,7 +13,8 @@ idx = server.register_namespace(uri)
 objects_node = server.get_objects_node()
 
 # Create 10 object nodes (e.g., Device1 to Device10)
-devices = []
+# Only the Temperature variables are used after setup, so keep just those
+temp_vars = []
 for i in range(1, 11):
     device_name = f"Device{i}"
 
@@ -30,7 +31,50 @@ for i in range(1, 11):
     )
 
     temp_var.set_writable()
-    devices.append((device, temp_var))
+    temp_vars.append(temp_var)
+
+# Temperatures are drawn as whole hundredths, i.e. already rounded to 2 places
+TEMP_CENTS = range(2000, 10001)
+
+# All temperatures are written in one WriteRequest through the internal
+# session instead of one set_value call (and request) per variable
+temp_nodeids = [var.nodeid for var in temp_vars]
+# Bound once; the per-tick path makes no attribute lookups on the server
+session_write = server.iserver.isession.write
+
+# The request and its WriteValues are built once and reused every tick.  Only
+# the DataValues are new each time: the address space keeps the DataValue it
+# is given as the node's value, so one mutated in place would change the
+# stored value without notifying subscribers.
+write_params = ua.WriteParameters()
+for nodeid in temp_nodeids:
+    wv = ua.WriteValue()
+    wv.NodeId = nodeid
+    wv.AttributeId = ua.AttributeIds.Value
+    write_params.NodesToWrite.append(wv)
+write_slots = write_params.NodesToWrite
+
+
+# Value attributes of the temperature nodes, for writing them directly
+aspace = server.iserver.aspace
+temp_attrs = [aspace._nodes[nodeid].attributes[ua.AttributeIds.Value] for nodeid in temp_nodeids]
+
+
+def write_temperatures(values):
+    if not any(attr.datachange_callbacks for attr in temp_attrs):
+        # Nobody monitors these nodes: store the values straight into the
+        # address space, skipping the write service and notification checks
+        with aspace._lock:
+            for attr, value in zip(temp_attrs, values):
+                attr.value = ua.DataValue(ua.Variant(value, ua.VariantType.Float))
+        return
+    for wv, value in zip(write_slots, values):
+        wv.Value = ua.DataValue(ua.Variant(value, ua.VariantType.Float))
+    session_write(write_params)
+
+
+# Output is block-buffered and flushed once per tick instead of on every line
+sys.stdout.reconfigure(line_buffering=False, write_through=False)
 
 # Start the server
 server.start()
@@ -38,12 +82,19 @@ print("✅ OPC UA Server running at opc.tcp://localhost:4840/freeopcua/server/")
 print("📡 Serving 10 object nodes with random temperature updates...\nPress Ctrl+C to stop.")
 
 try:
+    # Ticks are due at fixed 1 s deadlines, so the work done in a tick does not
+    # push the next one back; after a stall longer than a tick, realign to now
+    deadline = time.monotonic()
     while True:
-        for device, var in devices:
-            value = round(random.uniform(20.0, 100.0), 2)
-            var.set_value(value)
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Updated all device temperatures.")
-        time.sleep(1)
+        # One C-level draw for the whole batch: hundredths in [20.00, 100.00]
+        write_temperatures([c / 100 for c in random.choices(TEMP_CENTS, k=len(temp_nodeids))])
+        print(f"[{time.strftime('%H:%M:%S')}] Updated all device temperatures.")
+        sys.stdout.flush()
+        deadline += 1.0
+        now = time.monotonic()
+        if deadline < now:
+            deadline = now
+        time.sleep(deadline - now)
 except KeyboardInterrupt:
     print("\n🛑 Stopping server...")
 finally:
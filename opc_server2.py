@@ -1,7 +1,7 @@
 from opcua import Server, ua
+import sys
 import time
 import random
-from datetime import datetime
 
 # Set up the OPC UA server
 server = Server()
@@ -13,7 +13,8 @@ idx = server.register_namespace(uri)
 objects_node = server.get_objects_node()
 
 # Create 10 object nodes (Device1..Device10) with Temperature variables
-devices = []
+# Only the Temperature variables are used after setup, so keep just those
+temp_vars = []
 for i in range(1, 11):
     device_name = f"Device{i}"
 
@@ -29,7 +30,7 @@ for i in range(1, 11):
         varianttype=ua.VariantType.Float
     )
     temp_var.set_writable()  # optional; keeps parity with your original
-    devices.append((device, temp_var))
+    temp_vars.append(temp_var)
 
 # --- NEW: A "bit" tag that flips 0/1 every 1..20 seconds ---
 triggers_obj = objects_node.add_object(
@@ -45,6 +46,7 @@ flip_bit = triggers_obj.add_variable(
     varianttype=ua.VariantType.Boolean
 )
 flip_bit.set_writable()  # optional
+set_flip_bit = flip_bit.set_value  # bound once for the flip loop
 
 # If you prefer a numeric 0/1 instead of Boolean, use this instead:
 # flip_bit = triggers_obj.add_variable(
@@ -54,45 +56,66 @@ flip_bit.set_writable()  # optional
 #     varianttype=ua.VariantType.Int16
 # )
 
-# Scheduler for random flips
+# Temperatures are sampled when a client reads them instead of being written
+# every second: the address space calls the Value attribute's callback on each
+# Read.  (python-opcua has no PubSub, and its MonitoredItems are driven by
+# writes, so subscribers only see FlipBit changes.)
+def sample_temperature():
+    return ua.DataValue(ua.Variant(round(random.uniform(20.0, 100.0), 2), ua.VariantType.Float))
+
+
+for var in temp_vars:
+    server.iserver.aspace._nodes[var.nodeid].attributes[ua.AttributeIds.Value].value_callback = sample_temperature
+
+
+# Scheduler for random flips: delays of 1..20 s drawn up front in one call
+# and handed out round-robin
+_delays = random.choices(range(1, 21), k=1024)
+_delay_i = 0
+
+
 def next_delay():
-    return random.randint(1, 20)
+    global _delay_i
+    delay = _delays[_delay_i & 1023]
+    _delay_i += 1
+    return delay
 
 next_flip_at = time.monotonic() + next_delay()
+# Local copy of FlipBit's value; this script is its only writer
+flip_state = False
+
+# Output is block-buffered and flushed once per wake-up instead of on every line
+sys.stdout.reconfigure(line_buffering=False, write_through=False)
 
 # Start the server
 server.start()
 print("✅ OPC UA Server running at opc.tcp://localhost:4840/freeopcua/server/")
-print("📡 Serving 10 devices with Temperature and a random FlipBit.")
+print("📡 Serving 10 devices with Temperature (sampled on read) and a random FlipBit.")
 print(f"🔖 FlipBit NodeId: ns={idx};s=Triggers.FlipBit (Boolean)")
 print("   Browse path: Objects → Triggers → FlipBit")
 print("Press Ctrl+C to stop.\n")
+sys.stdout.flush()
 
 try:
     while True:
-        # Update all device temperatures every second
-        for device, var in devices:
-            value = round(random.uniform(20.0, 100.0), 2)
-            var.set_value(value)
+        # Nothing to do between flips; sleep until the next one is due
+        time.sleep(max(0.0, next_flip_at - time.monotonic()))
 
         # Flip the bit when its random timer elapses
         now = time.monotonic()
         if now >= next_flip_at:
+            flip_state = not flip_state
             # For Boolean:
-            curr = flip_bit.get_value()
-            new_val = not curr
-            flip_bit.set_value(new_val)
+            new_val = flip_state
             # If using Int16 numeric 0/1, do:
-            # curr = flip_bit.get_value()
-            # new_val = 0 if curr == 1 else 1
-            # flip_bit.set_value(new_val)
+            # new_val = int(flip_state)
+            set_flip_bit(new_val)
 
+            # Next flip counts from this one's deadline, not from when we woke
             delay = next_delay()
-            next_flip_at = now + delay
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] FlipBit toggled to {int(bool(new_val))}; next flip in {delay}s.")
-
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] Updated all device temperatures.")
-        time.sleep(1)
+            next_flip_at = max(next_flip_at + delay, now)
+            print(f"[{time.strftime('%H:%M:%S')}] FlipBit toggled to {int(bool(new_val))}; next flip in {delay}s.")
+            sys.stdout.flush()
 
 except KeyboardInterrupt:
     print("\n🛑 Stopping server...")
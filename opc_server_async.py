@@ -0,0 +1,65 @@
+import asyncio
+import random
+import sys
+import time
+
+from asyncua import Server, ua
+
+# Same dummy server as opc_server.py (Device1..Device10 with a Temperature
+# each, updated every second) on asyncua's event loop instead of the
+# thread-based opcua package; prefer this one when serving many tags.
+
+ENDPOINT = "opc.tcp://0.0.0.0:4840/freeopcua/server/"
+URI = "http://example.com/opcua/dummynodes/"
+
+# Temperatures are drawn as whole hundredths, i.e. already rounded to 2 places
+TEMP_CENTS = range(2000, 10001)
+
+
+async def main():
+    server = Server()
+    await server.init()
+    server.set_endpoint(ENDPOINT)
+    idx = await server.register_namespace(URI)
+
+    # Create 10 object nodes (e.g., Device1 to Device10)
+    temp_nodeids = []
+    for i in range(1, 11):
+        device_name = f"Device{i}"
+        device = await server.nodes.objects.add_object(ua.NodeId(device_name, idx), device_name)
+        temp_var = await device.add_variable(
+            ua.NodeId(f"{device_name}.Temperature", idx),
+            "Temperature",
+            0.0,
+            varianttype=ua.VariantType.Float,
+        )
+        await temp_var.set_writable()
+        temp_nodeids.append(temp_var.nodeid)
+
+    async with server:
+        print("✅ OPC UA Server running at opc.tcp://localhost:4840/freeopcua/server/")
+        print("📡 Serving 10 object nodes with random temperature updates...\nPress Ctrl+C to stop.")
+        # Output is block-buffered and flushed once per tick instead of on every line
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+        loop = asyncio.get_running_loop()
+        # Ticks are due at fixed 1 s deadlines; after a stall, realign to now
+        deadline = loop.time()
+        write_value = server.write_attribute_value  # bound once for the tick loop
+        while True:
+            # Written straight into the address space, no WriteRequest per tag
+            for nodeid, c in zip(temp_nodeids, random.choices(TEMP_CENTS, k=len(temp_nodeids))):
+                await write_value(nodeid, ua.DataValue(ua.Variant(c / 100, ua.VariantType.Float)))
+            print(f"[{time.strftime('%H:%M:%S')}] Updated all device temperatures.")
+            sys.stdout.flush()
+            deadline += 1.0
+            now = loop.time()
+            if deadline < now:
+                deadline = now
+            await asyncio.sleep(deadline - now)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping server...")
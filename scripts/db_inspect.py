@@ -1,42 +1,93 @@
 import sqlite3, os, sys
+from pathlib import Path
+
+# Per-row output (table rows, schema fields, sample rows) only with V=1
+VERBOSE = os.environ.get('V') == '1'
+
+
+def vprint(*a, **kw):
+    VERBOSE and print(*a, **kw)
+
 
 p = sys.argv[1] if len(sys.argv) > 1 else 'mydatabase.db'
 print('db:', p, 'exists:', os.path.exists(p), 'size:', os.path.getsize(p) if os.path.exists(p) else 0)
 if not os.path.exists(p):
     sys.exit(0)
-con = sqlite3.connect(p)
+# Read-only: no write locks or journal traffic from an inspection run
+con = sqlite3.connect(Path(os.path.abspath(p)).as_uri() + '?mode=ro', uri=True)
 cur = con.cursor()
+cur.execute('PRAGMA query_only=1')
 rows = cur.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
 print('tables:', [r[0] for r in rows])
+table_names = {r[0] for r in rows}
 if os.path.basename(p) == 'app.db':
     try:
         rs = cur.execute("SELECT id,name,schema_id,db_target_id,status,last_migrated_at,mapping_health,device_id FROM app_device_tables").fetchall()
         print('app_device_tables rows:', len(rs))
         for r in rs:
-            print(r)
+            vprint(r)
     except Exception as e:
         print('app_device_tables err', e)
-    try:
-        sch = cur.execute("SELECT id,name FROM app_schemas").fetchall()
+    # Schemas, targets and the default target come back from one UNION ALL
+    # query, tagged by source; tables that do not exist are left out of it.
+    # If the union fails (e.g. an older table missing a column), each part is
+    # queried on its own so one bad table only costs its own line
+    parts = {
+        'app_schemas': "SELECT 'schema', id, name, NULL, NULL FROM app_schemas",
+        'app_db_targets': "SELECT 'target', id, provider, conn, status FROM app_db_targets",
+        'app_meta': "SELECT 'meta', value, NULL, NULL, NULL FROM app_meta WHERE key='default_db_target'",
+    }
+    for t in parts:
+        if t not in table_names:
+            print(t, 'err', 'no such table:', t)
+    ok = {t for t in parts if t in table_names}
+    got = {'schema': [], 'target': [], 'meta': []}
+    if ok:
+        try:
+            for tag, *r in cur.execute(" UNION ALL ".join(parts[t] for t in parts if t in ok)):
+                got[tag].append(tuple(r))
+        except Exception:
+            got = {'schema': [], 'target': [], 'meta': []}
+            for t in [t for t in parts if t in ok]:
+                try:
+                    for tag, *r in cur.execute(parts[t]):
+                        got[tag].append(tuple(r))
+                except Exception as e:
+                    print(t, 'err', e)
+                    ok.discard(t)
+    if 'app_schemas' in ok:
+        sch = [r[:2] for r in got['schema']]
         print('schemas:', sch)
-        for sid, name in sch:
-            f = cur.execute("SELECT key,type,unit,scale,desc FROM app_schema_fields WHERE schema_id=?", (sid,)).fetchall()
-            print('schema', sid, name, 'fields:', f)
-    except Exception as e:
-        print('schemas err', e)
-    try:
-        tgs = cur.execute("SELECT id,provider,conn,status FROM app_db_targets").fetchall()
-        print('targets:', tgs)
-        row = cur.execute("SELECT value FROM app_meta WHERE key='default_db_target'").fetchone()
-        print('default_target:', row)
-    except Exception as e:
-        print('targets err', e)
-for t in ['neuract__device_mappings','neuract_device_mappings','device_mappings']:
+    if 'app_schemas' in ok and VERBOSE:
+        try:
+            # One query for every schema's fields, grouped by schema_id here
+            fields = {}
+            for sid, *f in cur.execute("SELECT schema_id,key,type,unit,scale,desc FROM app_schema_fields"):
+                fields.setdefault(sid, []).append(tuple(f))
+            for sid, name in sch:
+                print('schema', sid, name, 'fields:', fields.get(sid, []))
+        except Exception as e:
+            print('schemas err', e)
+    if 'app_db_targets' in ok:
+        print('targets:', got['target'])
+    if 'app_meta' in ok:
+        print('default_target:', got['meta'][0][:1] if got['meta'] else None)
+# Count every mapping table that exists in one UNION ALL query
+mapping_tables = ['neuract__device_mappings','neuract_device_mappings','device_mappings']
+existing = [t for t in mapping_tables if t in table_names]
+counts = {}
+if existing:
+    counts = dict(cur.execute(" UNION ALL ".join(f"SELECT '{t}', COUNT(1) FROM {t}" for t in existing)).fetchall())
+for t in mapping_tables:
+    if t not in counts:
+        print(t, 'err', 'no such table:', t)
+        continue
+    print(t, 'rows', counts[t])
+    if not VERBOSE:
+        continue
     try:
-        cnt = cur.execute(f"SELECT COUNT(1) FROM {t}").fetchone()[0]
-        print(t, 'rows', cnt)
         rs = cur.execute(f"SELECT * FROM {t} LIMIT 5").fetchall()
-        print('sample rows', rs)
+        vprint('sample rows', rs)
     except Exception as e:
         print(t, 'err', e)
 con.close()
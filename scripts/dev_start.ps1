@@ -58,24 +58,36 @@ $env:AGENT_STRICT_PORT = "1"
 
 $agent = Start-Process -PassThru -NoNewWindow python -ArgumentList "agent/run_agent.py" -WorkingDirectory "$PSScriptRoot\.."
 
-# Wait for lockfile and read port+token, prefer LocalAppData (dev agent) over ProgramData (service)
+# Wait for lockfile and read port+token. Check in the agent's write order
+# (ProgramData, LocalAppData, CWD); the agent removes lower-priority stale copies
 $pdLock   = Join-Path $env:ProgramData   "PLCLogger\agent\agent.lock.json"
 $laLock   = if ($env:LOCALAPPDATA) { Join-Path $env:LOCALAPPDATA "PLCLogger\agent\agent.lock.json" } else { $null }
 $cwdLock  = Join-Path "$PSScriptRoot\.." "agent.dev.lock.json"
 
 for ($i=0; $i -lt 80; $i++) {
-  if ($laLock -and (Test-Path $laLock)) { break }
   if (Test-Path $pdLock) { break }
+  if ($laLock -and (Test-Path $laLock)) { break }
   if (Test-Path $cwdLock) { break }
   Start-Sleep -Milliseconds 250
 }
 
 function _tryReadJson([string]$path) { try { if (Test-Path $path) { return Get-Content $path -Raw | ConvertFrom-Json } } catch {}; return $null }
 
-$data = $null
-if ($laLock) { $data = _tryReadJson $laLock }
-if (-not $data) { $data = _tryReadJson $cwdLock }
-if (-not $data) { $data = _tryReadJson $pdLock }
+# Prefer the lockfile written by the agent we just started, else follow the writer's order
+function Read-AgentLock($proc) {
+  $locks = @($pdLock, $laLock, $cwdLock) | Where-Object { $_ }
+  foreach ($lp in $locks) {
+    $d = _tryReadJson $lp
+    if ($d -and $proc -and ($d.pid -eq $proc.Id)) { return $d }
+  }
+  foreach ($lp in $locks) {
+    $d = _tryReadJson $lp
+    if ($d) { return $d }
+  }
+  return $null
+}
+
+$data = Read-AgentLock $agent
 
 if ($data) {
   $uiBase = "http://127.0.0.1:" + $data.port
@@ -93,9 +105,7 @@ if ($data) {
       $env:AGENT_STRICT_PORT = "1"
       $agent = Start-Process -PassThru -NoNewWindow python -ArgumentList "agent/run_agent.py" -WorkingDirectory "$PSScriptRoot\.."
       Start-Sleep -Milliseconds 750
-      if ($laLock) { $data = _tryReadJson $laLock }
-      if (-not $data) { $data = _tryReadJson $cwdLock }
-      if (-not $data) { $data = _tryReadJson $pdLock }
+      $data = Read-AgentLock $agent
       if ($data) {
         $uiBase = "http://127.0.0.1:" + $data.port
         if ($data.token) { $env:VITE_AGENT_TOKEN = $data.token }
@@ -116,10 +126,7 @@ if ($data -and $data.port -ne $Port) {
   $env:AGENT_STRICT_PORT = "1"
   $agent = Start-Process -PassThru -NoNewWindow powershell -ArgumentList "-NoProfile","-Command","python","agent/run_agent.py" -WorkingDirectory "$PSScriptRoot\.."
   Start-Sleep -Milliseconds 750
-  $data = $null
-  if ($laLock) { $data = _tryReadJson $laLock }
-  if (-not $data) { $data = _tryReadJson $cwdLock }
-  if (-not $data) { $data = _tryReadJson $pdLock }
+  $data = Read-AgentLock $agent
   if ($data) {
     $uiBase = "http://127.0.0.1:" + $data.port
     if ($data.token) { $env:VITE_AGENT_TOKEN = $data.token }
@@ -3,21 +3,41 @@ sys.path.insert(0, os.getcwd())
 from agent.plc_agent.api.store import Store
 from agent.plc_agent.api.routers.mappings import _load_mapping_from_user_db
 
+# Per-table details only with V=1; the health line is always printed
+VERBOSE = os.environ.get('V') == '1'
+
+
+def vprint(*a, **kw):
+    VERBOSE and print(*a, **kw)
+
+
 st = Store.instance()
 st.load_from_app_db()
-print('tables loaded:', len(st.list_tables()))
-for t in st.list_tables():
-    print('table:', t['id'], t['name'], 'devId:', t.get('deviceId'))
-    loaded = _load_mapping_from_user_db(t)
-    print('loaded mapping deviceId:', loaded and loaded.get('deviceId'))
-    print('loaded rows keys:', list((loaded or {}).get('rows', {}).keys()))
-    # After loading, store should have rows
-    if loaded:
-        st.replace_mapping(t['id'], loaded)
+tables = st.list_tables()
+print('tables loaded:', len(tables))
+# schema_id -> required field keys, resolved once per schema
+schema_cache: dict[str, list[str]] = {}
+for t in tables:
+    vprint('table:', t['id'], t['name'], 'devId:', t.get('deviceId'))
     m = st.get_mapping(t['id'])
-    print('store rows keys:', list((m or {}).get('rows', {}).keys()))
+    if (m or {}).get('rows'):
+        # Already mapped in the store (from app.db); no need to read the user DB
+        vprint('mapping already loaded; skipping user DB')
+    else:
+        loaded = _load_mapping_from_user_db(t)
+        vprint('loaded mapping deviceId:', loaded and loaded.get('deviceId'))
+        loaded_rows = (loaded or {}).get('rows', {})
+        vprint('loaded rows keys:', list(loaded_rows))
+        # After loading, store should have rows
+        if loaded:
+            st.replace_mapping(t['id'], loaded)
+            m = st.get_mapping(t['id'])
+    vprint('store rows keys:', list((m or {}).get('rows', {})))
     # compute health
-    sch = st.get_schema(t.get('schemaId')) or {'fields': []}
-    required = [f.get('key') for f in (sch.get('fields') or [])]
-    print('health:', st.mapping_health(t['id'], required_fields=required))
+    sid = t.get('schemaId')
+    required = schema_cache.get(sid)
+    if required is None:
+        sch = st.get_schema(sid) or {'fields': []}
+        required = schema_cache[sid] = [f.get('key') for f in (sch.get('fields') or [])]
+    print('health:', t['id'], st.mapping_health(t['id'], required_fields=required))
 